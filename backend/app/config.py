@@ -9,6 +9,8 @@ class Settings(BaseSettings):
     db_path: Path = Path.home() / ".beacon" / "traces.db"
     backend_port: int = 7474
     log_level: str = "INFO"
+    # Open connections to configured LLM providers at startup
+    warmup_providers: bool = True
 
     model_config = {"env_prefix": "BEACON_", "env_file": ".env"}
 
@@ -6,12 +6,15 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.config import settings
+from app.utils import json as json_utils
 
 settings.db_path.parent.mkdir(parents=True, exist_ok=True)
 
 engine = create_engine(
     f"sqlite:///{settings.db_path}",
     connect_args={"check_same_thread": False},
+    json_serializer=json_utils.dumps,
+    json_deserializer=json_utils.loads,
 )
 
 
@@ -51,12 +54,82 @@ def _run_migrations() -> None:
         if "sdk_language" not in span_columns:
             conn.execute(text("ALTER TABLE spans ADD COLUMN sdk_language TEXT"))
             conn.commit()
+        if "name_lower" not in span_columns:
+            conn.execute(text("ALTER TABLE spans ADD COLUMN name_lower TEXT"))
+            conn.execute(text("UPDATE spans SET name_lower = lower(name)"))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_spans_name_lower "
+                    "ON spans (name_lower)"
+                )
+            )
+            conn.commit()
+
+        if "cost_usd" not in span_columns:
+            conn.execute(text("ALTER TABLE spans ADD COLUMN cost_usd REAL"))
+            conn.execute(text("ALTER TABLE spans ADD COLUMN tokens_total INTEGER"))
+            numeric = (
+                "CASE WHEN json_type(attributes, '$.\"{0}\"') IN ('integer', 'real') "
+                "THEN CAST(json_extract(attributes, '$.\"{0}\"') AS {1}) END"
+            )
+            conn.execute(
+                text(
+                    f"UPDATE spans SET "
+                    f"cost_usd = {numeric.format('llm.cost_usd', 'REAL')}, "
+                    f"tokens_total = {numeric.format('llm.tokens.total', 'INTEGER')}"
+                )
+            )
+            conn.commit()
+
+        from app.models import FTS_AVAILABLE, SPAN_FTS_DDL
+
+        has_fts = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='span_fts'")
+        ).first()
+        if FTS_AVAILABLE and has_fts is None:
+            for stmt in SPAN_FTS_DDL:
+                conn.execute(text(stmt))
+            conn.execute(text("INSERT INTO span_fts(span_fts) VALUES ('rebuild')"))
+            conn.commit()
+
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_spans_trace_id_start_time "
+                "ON spans (trace_id, start_time)"
+            )
+        )
+        conn.execute(text("DROP INDEX IF EXISTS idx_spans_trace_id"))
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_traces_status_created_at "
+                "ON traces (status, created_at)"
+            )
+        )
+        conn.execute(text("DROP INDEX IF EXISTS idx_traces_status"))
+        conn.commit()
 
         result = conn.execute(text("PRAGMA table_info(traces)"))
         trace_columns = {row[1] for row in result}
         if "sdk_language" not in trace_columns:
             conn.execute(text("ALTER TABLE traces ADD COLUMN sdk_language TEXT"))
             conn.commit()
+        if "error_count" not in trace_columns:
+            conn.execute(
+                text("ALTER TABLE traces ADD COLUMN error_count INTEGER DEFAULT 0")
+            )
+            conn.execute(
+                text("ALTER TABLE traces ADD COLUMN pending_count INTEGER DEFAULT 0")
+            )
+            conn.execute(
+                text(
+                    "UPDATE traces SET "
+                    "error_count = (SELECT count(*) FROM spans WHERE "
+                    "spans.trace_id = traces.trace_id AND spans.status = 'error'), "
+                    "pending_count = (SELECT count(*) FROM spans WHERE "
+                    "spans.trace_id = traces.trace_id AND spans.status = 'unset')"
+                )
+            )
+            conn.commit()
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -21,13 +22,27 @@ from app.routers import (
     stats,
     traces,
 )
+from app.services import http_client, llm_client, settings_service
 from app.ws.manager import ws_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     init_db()
+    # Pre-connect to providers the user has keys for, without delaying startup
+    warmups = (
+        [
+            asyncio.create_task(llm_client.warmup(p["provider"]))
+            for p in settings_service.list_providers()
+            if p["configured"]
+        ]
+        if app_settings.warmup_providers
+        else []
+    )
     yield
+    for task in warmups:
+        task.cancel()
+    await http_client.close_client()
 
 
 app = FastAPI(
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, Float, ForeignKey, Index, Integer, Text
+import sqlite3
+
+from sqlalchemy import DDL, JSON, Column, Float, ForeignKey, Index, Integer, Text, event
+from sqlalchemy.orm import relationship
 
 from app.database import Base
 
@@ -14,15 +17,24 @@ class Trace(Base):
     end_time = Column(Float)
     span_count = Column(Integer, default=0)
     status = Column(Text, default="unset")
-    tags = Column(Text, default="{}")
+    # Spans in error / unset status, so status is maintained without a re-scan
+    error_count = Column(Integer, default=0)
+    pending_count = Column(Integer, default=0)
+    tags = Column(JSON, default=dict)
     total_cost_usd = Column(Float, default=0)
     total_tokens = Column(Integer, default=0)
     sdk_language = Column(Text)
     created_at = Column(Float, nullable=False)
 
+    # Read-only: spans are written through span_service, and deleting a trace
+    # relies on ON DELETE CASCADE rather than the ORM
+    spans = relationship("Span", order_by="Span.start_time", viewonly=True)
+
     __table_args__ = (
         Index("idx_traces_created_at", "created_at"),
-        Index("idx_traces_status", "status"),
+        # list_traces filters by status newest first; also serves plain
+        # status lookups, so there is no separate status index
+        Index("idx_traces_status_created_at", "status", "created_at"),
     )
 
 
@@ -38,24 +50,60 @@ class Span(Base):
     parent_span_id = Column(Text)
     span_type = Column(Text, nullable=False)
     name = Column(Text, nullable=False)
+    # Lowercased copy of name so search can use plain LIKE instead of ilike
+    name_lower = Column(Text)
     status = Column(Text, default="unset")
     error_message = Column(Text)
     start_time = Column(Float, nullable=False)
     end_time = Column(Float)
-    attributes = Column(Text, default="{}")
+    attributes = Column(JSON, default=dict)
+    # Copies of llm.cost_usd / llm.tokens.total so readers can skip attributes
+    cost_usd = Column(Float)
+    tokens_total = Column(Integer)
     annotations = Column(Text, default="[]")
     sdk_language = Column(Text)
     created_at = Column(Float, nullable=False)
 
     __table_args__ = (
-        Index("idx_spans_trace_id", "trace_id"),
+        # Spans of one trace in start order (detail, graph); also serves
+        # plain trace_id lookups, so there is no separate trace_id index
+        Index("idx_spans_trace_id_start_time", "trace_id", "start_time"),
         Index("idx_spans_parent_span_id", "parent_span_id"),
         Index("idx_spans_span_type", "span_type"),
         Index("idx_spans_start_time", "start_time"),
         Index("idx_spans_name", "name"),
+        Index("idx_spans_name_lower", "name_lower"),
     )
 
 
+# Full-text index over span name and attributes, kept in sync by triggers.
+# The trigram tokenizer gives case-insensitive substring matching (queries of
+# 3+ characters), the same semantics as the LIKE search it replaces. It needs
+# SQLite 3.34+; on older builds the index is skipped and search uses LIKE.
+FTS_AVAILABLE = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+SPAN_FTS_DDL: tuple[str, ...] = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS span_fts USING fts5("
+    "name, attributes, content='spans', content_rowid='rowid', "
+    "tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS spans_fts_insert AFTER INSERT ON spans BEGIN "
+    "INSERT INTO span_fts(rowid, name, attributes) "
+    "VALUES (new.rowid, new.name, new.attributes); END",
+    "CREATE TRIGGER IF NOT EXISTS spans_fts_delete AFTER DELETE ON spans BEGIN "
+    "INSERT INTO span_fts(span_fts, rowid, name, attributes) "
+    "VALUES ('delete', old.rowid, old.name, old.attributes); END",
+    "CREATE TRIGGER IF NOT EXISTS spans_fts_update AFTER UPDATE ON spans BEGIN "
+    "INSERT INTO span_fts(span_fts, rowid, name, attributes) "
+    "VALUES ('delete', old.rowid, old.name, old.attributes); "
+    "INSERT INTO span_fts(rowid, name, attributes) "
+    "VALUES (new.rowid, new.name, new.attributes); END",
+)
+
+if FTS_AVAILABLE:
+    for _stmt in SPAN_FTS_DDL:
+        event.listen(Span.__table__, "after_create", DDL(_stmt))
+
+
 class PromptVersion(Base):
     __tablename__ = "prompt_versions"
 
@@ -86,3 +134,13 @@ class ReplayRun(Base):
     new_output = Column(Text, nullable=False)
     diff = Column(Text, nullable=False)
     created_at = Column(Float, nullable=False)
+
+
+class LlmCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    cache_key = Column(Text, primary_key=True)
+    completion = Column(Text, nullable=False)
+    input_tokens = Column(Integer, nullable=False)
+    output_tokens = Column(Integer, nullable=False)
+    created_at = Column(Float, nullable=False)
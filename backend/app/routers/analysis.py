@@ -7,7 +7,6 @@ trace comparison, and trace summarization.
 
 from __future__ import annotations
 
-import json
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -28,6 +27,7 @@ from app.schemas import (
     TraceSummaryAnalysisResponse,
 )
 from app.services import analysis_service
+from app.utils import json as json_utils
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
@@ -121,14 +121,12 @@ async def prompt_suggestions(
     """Analyze an LLM call's prompt and suggest improvements."""
     try:
         span = analysis_service.get_span(db, request.span_id)
-        attrs: dict[str, Any] = {}
-        if span.attributes:
-            try:
-                attrs = json.loads(span.attributes)
-            except (ValueError, TypeError):
-                pass
-
-        original_prompt = str(attrs.get("llm.prompt", ""))
+        attrs: dict[str, Any] = span.attributes or {}
+
+        prompt_raw = attrs.get("llm.prompt", "")
+        original_prompt = (
+            prompt_raw if isinstance(prompt_raw, str) else json_utils.dumps(prompt_raw)
+        )
 
         system_prompt = (
             "You are an AI prompt engineering assistant. Analyze the given LLM prompt "
@@ -4,13 +4,15 @@ from __future__ import annotations
 
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.services import span_service
 from app.services.otlp_service import convert_otlp_to_spans
+from app.utils import json as json_utils
 from app.ws.manager import ws_manager
 
 router = APIRouter(prefix="/otlp", tags=["otlp"])
@@ -21,9 +23,39 @@ class OtlpIngestResponse(BaseModel):
     rejected: int
 
 
-@router.post("/traces", response_model=OtlpIngestResponse)
+async def _otlp_payload(request: Request) -> dict[str, Any]:
+    """Parse the request body with orjson.
+
+    OTLP payloads are large and deeply nested, and are only ever read as
+    plain dicts, so the body is not routed through FastAPI's stdlib parse
+    and Pydantic ``dict`` validation.
+    """
+    body = await request.body()
+    try:
+        payload = json_utils.loads(body)
+    except json_utils.JSONDecodeError as exc:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body",), "msg": str(exc)}]
+        ) from exc
+    if not isinstance(payload, dict):
+        raise RequestValidationError(
+            [{"type": "dict_type", "loc": ("body",), "msg": "Expected an object"}]
+        )
+    return payload
+
+
+@router.post(
+    "/traces",
+    response_model=OtlpIngestResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"type": "object"}}},
+        }
+    },
+)
 async def ingest_otlp_traces(
-    payload: dict[str, Any],
+    payload: Annotated[dict[str, Any], Depends(_otlp_payload)],
     db: Annotated[Session, Depends(get_db)],
 ) -> OtlpIngestResponse:
     """Accept traces in OTLP JSON format and ingest them as Beacon spans."""
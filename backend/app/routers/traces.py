@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import json
 import time
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -27,6 +26,7 @@ from app.schemas import (
     TraceSummary,
 )
 from app.services import export_service, import_service, trace_service
+from app.utils import json as json_utils
 
 router = APIRouter(prefix="/traces", tags=["traces"])
 
@@ -88,7 +88,7 @@ async def bulk_export_traces(
         if result is not None:
             exports.append(result)
 
-    return BulkTraceExportData(
+    return BulkTraceExportData.model_construct(
         exported_at=time.time(),
         traces=exports,
     )
@@ -163,8 +163,8 @@ async def export_trace(
         result = export_service.export_trace_csv(db, trace_id)
         if result is None:
             raise HTTPException(status_code=404, detail="Trace not found")
-        return Response(
-            content=result,
+        return StreamingResponse(
+            result,
             media_type="text/csv",
             headers={
                 "Content-Disposition": f'attachment; filename="trace-{trace_id[:8]}.csv"'
@@ -176,7 +176,7 @@ async def export_trace(
         if result is None:
             raise HTTPException(status_code=404, detail="Trace not found")
         return Response(
-            content=json.dumps(result, indent=2),
+            content=json_utils.dumps(result, indent=True),
             media_type="application/json",
             headers={
                 "Content-Disposition": f'attachment; filename="trace-{trace_id[:8]}-otel.json"'
@@ -232,6 +232,7 @@ class PlaygroundCompareRequest(BaseModel):
     messages: list[PlaygroundMessage]
     system_prompt: str | None = None
     models: list[str]
+    timeout: float | None = Field(default=None, gt=0, le=300)
 
 
 class CompareResultItem(BaseModel):
@@ -6,7 +6,6 @@ and parse structured JSON responses into Pydantic models.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 from typing import Any, TypeVar
@@ -22,6 +21,7 @@ from app.services.llm_client import (
     call_openai,
     provider_for_model,
 )
+from app.utils import json as json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -75,12 +75,7 @@ def build_trace_context(spans: list[models.Span]) -> str:
 
     lines: list[str] = []
     for i, span in enumerate(spans, 1):
-        attrs: dict[str, Any] = {}
-        if span.attributes:
-            try:
-                attrs = json.loads(span.attributes)
-            except (json.JSONDecodeError, TypeError):
-                pass
+        attrs: dict[str, Any] = span.attributes or {}
 
         duration_ms: float | None = None
         if span.start_time is not None and span.end_time is not None:
@@ -115,7 +110,7 @@ def build_trace_context(spans: list[models.Span]) -> str:
             if key in attrs:
                 val = attrs[key]
                 # Truncate long values
-                val_str = str(val)
+                val_str = val if isinstance(val, str) else json_utils.dumps(val)
                 if len(val_str) > 500:
                     val_str = val_str[:500] + "..."
                 lines.append(f"    {key}: {val_str}")
@@ -148,13 +143,17 @@ async def call_analysis_llm(system_prompt: str, user_prompt: str) -> str:
     ]
 
     if provider == "openai":
-        completion, _, _ = await call_openai(api_key, model, messages, temperature=0.2)
+        completion, _, _, _ = await call_openai(
+            api_key, model, messages, temperature=0.2
+        )
     elif provider == "anthropic":
-        completion, _, _ = await call_anthropic(
+        completion, _, _, _ = await call_anthropic(
             api_key, model, messages, temperature=0.2
         )
     elif provider == "google":
-        completion, _, _ = await call_google(api_key, model, messages, temperature=0.2)
+        completion, _, _, _ = await call_google(
+            api_key, model, messages, temperature=0.2
+        )
     else:
         raise ValueError(f"Analysis does not support provider: {provider}")
 
@@ -189,8 +188,8 @@ def parse_structured_response(raw_text: str, response_model: type[T]) -> T:
         text = text[start : end + 1]
 
     try:
-        data = json.loads(text)
-    except json.JSONDecodeError as exc:
+        data = json_utils.loads(text)
+    except json_utils.JSONDecodeError as exc:
         raise ValueError(f"LLM returned invalid JSON: {exc}") from exc
 
     try:
@@ -4,10 +4,11 @@ from __future__ import annotations
 
 import csv
 import io
-import json
 import time
+from collections.abc import Iterator, Sequence
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 from app import models
@@ -39,13 +40,12 @@ def export_trace_json(db: Session, trace_id: str) -> TraceExportData | None:
         .all()
     )
 
-    summary = _trace_to_summary(trace)
-    span_responses = [span_to_response(s) for s in spans]
-
-    return TraceExportData(
+    # Summary and spans are built from our own rows without validation,
+    # so the envelope skips it too.
+    return TraceExportData.model_construct(
         exported_at=time.time(),
-        trace=summary,
-        spans=span_responses,
+        trace=_trace_to_summary(trace),
+        spans=[span_to_response(s) for s in spans],
     )
 
 
@@ -94,89 +94,101 @@ def export_trace_otel(db: Session, trace_id: str) -> dict[str, object] | None:
     }
 
 
-def export_trace_csv(db: Session, trace_id: str) -> str | None:
-    """Export a single trace as flat CSV with one row per span."""
-    trace = db.execute(
-        select(models.Trace).where(models.Trace.trace_id == trace_id)
-    ).scalar_one_or_none()
+_CSV_HEADER = (
+    "trace_id",
+    "span_id",
+    "parent_span_id",
+    "name",
+    "span_type",
+    "start_time",
+    "end_time",
+    "duration_ms",
+    "status",
+    "cost",
+    "tokens",
+)
+_CSV_CHUNK_ROWS = 500
 
-    if trace is None:
+
+def export_trace_csv(db: Session, trace_id: str) -> Iterator[str] | None:
+    """Export a single trace as flat CSV with one row per span.
+
+    Rows are loaded up front (the session is released before a streamed
+    response is sent) and formatted lazily, a chunk of rows at a time.
+    """
+    trace_exists = db.execute(
+        select(models.Trace.trace_id).where(models.Trace.trace_id == trace_id)
+    ).first()
+    if trace_exists is None:
         return None
 
-    spans = (
-        db.execute(
-            select(models.Span)
-            .where(models.Span.trace_id == trace_id)
-            .order_by(models.Span.start_time)
+    rows = db.execute(
+        select(
+            models.Span.trace_id,
+            models.Span.span_id,
+            models.Span.parent_span_id,
+            models.Span.name,
+            models.Span.span_type,
+            models.Span.start_time,
+            models.Span.end_time,
+            models.Span.status,
+            models.Span.cost_usd,
+            models.Span.tokens_total,
         )
-        .scalars()
-        .all()
-    )
+        .where(models.Span.trace_id == trace_id)
+        .order_by(models.Span.start_time)
+    ).all()
+    return _csv_chunks(rows)
+
 
+def _csv_chunks(rows: Sequence[Row[Any]]) -> Iterator[str]:
     output = io.StringIO()
     writer = csv.writer(output)
-    writer.writerow(
-        [
-            "trace_id",
-            "span_id",
-            "parent_span_id",
-            "name",
-            "span_type",
-            "start_time",
-            "end_time",
-            "duration_ms",
-            "status",
-            "cost",
-            "tokens",
-        ]
-    )
-
-    for span in spans:
-        attrs = json.loads(span.attributes or "{}")
+    writer.writerow(_CSV_HEADER)
+    for i, row in enumerate(rows, 1):
         duration_ms = (
-            (span.end_time - span.start_time) * 1000
-            if span.end_time is not None
-            else ""
+            (row.end_time - row.start_time) * 1000 if row.end_time is not None else ""
         )
-        cost = attrs.get("llm.cost_usd", "")
-        tokens = attrs.get("llm.tokens.total", "")
-
         writer.writerow(
-            [
-                span.trace_id,
-                span.span_id,
-                span.parent_span_id or "",
-                span.name,
-                span.span_type,
-                span.start_time,
-                span.end_time or "",
+            (
+                row.trace_id,
+                row.span_id,
+                row.parent_span_id or "",
+                row.name,
+                row.span_type,
+                row.start_time,
+                row.end_time or "",
                 duration_ms,
-                span.status,
-                cost,
-                tokens,
-            ]
+                row.status,
+                "" if row.cost_usd is None else row.cost_usd,
+                "" if row.tokens_total is None else row.tokens_total,
+            )
         )
+        if i % _CSV_CHUNK_ROWS == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
 
-    return output.getvalue()
+# OTEL status codes: 0=UNSET, 1=OK, 2=ERROR
+_OTEL_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
 
 
 def _span_to_otel(span: models.Span) -> dict[str, object]:
     """Convert a DB span to OTEL JSON span format."""
-    attrs = json.loads(span.attributes or "{}")
+    attrs = span.attributes or {}
 
     # Convert epoch seconds to nanoseconds
     start_ns = int(span.start_time * 1_000_000_000)
     end_ns = int(span.end_time * 1_000_000_000) if span.end_time else 0
 
-    # OTEL status codes: 0=UNSET, 1=OK, 2=ERROR
-    status_map = {"unset": 0, "ok": 1, "error": 2}
-    status_code = status_map.get(span.status, 0)
+    status_code = _OTEL_STATUS_CODES.get(span.status, 0)
 
     otel_attrs = [
         {"key": "span_type", "value": {"stringValue": span.span_type}},
+        *(_to_otel_attribute(key, value) for key, value in attrs.items()),
     ]
-    for key, value in attrs.items():
-        otel_attrs.append(_to_otel_attribute(key, value))
 
     if span.error_message:
         otel_attrs.append(
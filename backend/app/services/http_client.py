@@ -0,0 +1,43 @@
+"""Process-wide HTTP client for outbound provider calls.
+
+One pooled ``httpx.AsyncClient`` is shared by replay, playground, analysis,
+and demo LLM calls so connections and TLS sessions are reused instead of
+being re-established on every request.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+
+# Multiplex concurrent calls to one provider over a single connection when
+# the optional ``h2`` package is installed (``pip install httpx[http2]``).
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+_LIMITS = httpx.Limits(
+    max_connections=300,
+    max_keepalive_connections=100,
+    keepalive_expiry=60,
+)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=_TIMEOUT, limits=_LIMITS, http2=_HTTP2_AVAILABLE
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared AsyncClient. Called on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
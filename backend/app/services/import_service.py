@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import time
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app import models
@@ -33,30 +33,53 @@ def import_trace(db: Session, data: TraceExportData) -> tuple[str, int]:
         logger.warning("Duplicate trace rejected: %s", trace_data.trace_id)
         raise ValueError(f"Trace {trace_data.trace_id} already exists")
 
-    # Compute aggregates from spans
+    # Compute aggregates and build span rows in a single pass
     total_cost = 0.0
     total_tokens = 0
-    has_error = False
-    all_ok = True
+    error_count = 0
+    pending_count = 0
+    now = time.time()
+    span_rows: list[dict[str, Any]] = []
 
     for span in spans_data:
+        span_status = span.status.value
         cost = span.attributes.get("llm.cost_usd")
-        if isinstance(cost, (int, float)):
-            total_cost += cost
+        if not isinstance(cost, (int, float)):
+            cost = None
         tok = span.attributes.get("llm.tokens.total")
-        if isinstance(tok, (int, float)):
-            total_tokens += int(tok)
-        if span.status == "error":
-            has_error = True
-        if span.status != "ok":
-            all_ok = False
-
-    if has_error:
+        tok = int(tok) if isinstance(tok, (int, float)) else None
+        total_cost += cost or 0.0
+        total_tokens += tok or 0
+        if span_status == "error":
+            error_count += 1
+        elif span_status == "unset":
+            pending_count += 1
+
+        span_rows.append(
+            {
+                "span_id": span.span_id,
+                "trace_id": trace_data.trace_id,
+                "parent_span_id": span.parent_span_id,
+                "span_type": span.span_type.value,
+                "name": span.name,
+                "name_lower": span.name.lower(),
+                "status": span_status,
+                "error_message": span.error_message,
+                "start_time": span.start_time,
+                "end_time": span.end_time,
+                "attributes": span.attributes,
+                "cost_usd": cost,
+                "tokens_total": tok,
+                "created_at": now,
+            }
+        )
+
+    if error_count:
         status = "error"
-    elif all_ok and len(spans_data) > 0:
-        status = "ok"
-    else:
+    elif pending_count or not spans_data:
         status = "unset"
+    else:
+        status = "ok"
 
     tags = trace_data.tags if isinstance(trace_data.tags, dict) else {}
 
@@ -67,32 +90,19 @@ def import_trace(db: Session, data: TraceExportData) -> tuple[str, int]:
         end_time=trace_data.end_time,
         span_count=len(spans_data),
         status=status,
-        tags=json.dumps(tags),
+        error_count=error_count,
+        pending_count=pending_count,
+        tags=tags,
         total_cost_usd=total_cost,
         total_tokens=total_tokens,
-        created_at=time.time(),
+        created_at=now,
     )
     try:
         db.add(trace)
         db.flush()
-
-        now = time.time()
-        for span in spans_data:
-            db_span = models.Span(
-                span_id=span.span_id,
-                trace_id=trace_data.trace_id,
-                parent_span_id=span.parent_span_id,
-                span_type=span.span_type.value,
-                name=span.name,
-                status=span.status.value,
-                error_message=span.error_message,
-                start_time=span.start_time,
-                end_time=span.end_time,
-                attributes=json.dumps(span.attributes),
-                created_at=now,
-            )
-            db.add(db_span)
-
+        if span_rows:
+            # One executemany INSERT instead of constructing ORM objects
+            db.execute(insert(models.Span), span_rows)
         db.commit()
     except Exception:
         db.rollback()
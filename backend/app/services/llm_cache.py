@@ -0,0 +1,79 @@
+"""Response cache for deterministic LLM replays.
+
+Replaying the same prompt at ``temperature <= 0`` should yield the same
+completion, so the provider response is stored in the ``llm_cache`` table
+and reused instead of paying for another multi-second provider call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils import json as json_utils
+
+
+def is_cacheable(temperature: float) -> bool:
+    """Only deterministic calls are safe to serve from cache."""
+    return temperature <= 0.0
+
+
+def make_key(
+    provider: str,
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float,
+    max_tokens: int | None,
+) -> str:
+    """Hash every request parameter that can change the completion."""
+    payload = json_utils.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get(db: Session, key: str) -> tuple[str, int, int] | None:
+    """Return (completion, input_tokens, output_tokens) for *key*, or None."""
+    row = db.execute(
+        select(
+            models.LlmCacheEntry.completion,
+            models.LlmCacheEntry.input_tokens,
+            models.LlmCacheEntry.output_tokens,
+        ).where(models.LlmCacheEntry.cache_key == key)
+    ).one_or_none()
+    if row is None:
+        return None
+    return row.completion, row.input_tokens, row.output_tokens
+
+
+def put(
+    db: Session,
+    key: str,
+    completion: str,
+    input_tokens: int,
+    output_tokens: int,
+) -> None:
+    """Store a provider response. Does not commit."""
+    db.execute(
+        insert(models.LlmCacheEntry)
+        .values(
+            cache_key=key,
+            completion=completion,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            created_at=time.time(),
+        )
+        .prefix_with("OR REPLACE")
+    )
@@ -6,98 +6,176 @@ the same calling logic and price table.
 
 from __future__ import annotations
 
+import functools
+import logging
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Any
 
 import httpx
 
+from app.services.http_client import get_client
+from app.utils import json as json_utils
+
+logger = logging.getLogger(__name__)
+
 # Price table: (input_cost_per_1M, output_cost_per_1M)
 # NOTE: The SDK maintains a sister price table in sdk/beacon_sdk/pricing.py
 # with prefix-matching semantics. When updating prices here, also update there.
-PRICE_TABLE: dict[str, tuple[float, float]] = {
-    # OpenAI — latest
-    "gpt-4.1": (2.00, 8.00),
-    "gpt-4.1-mini": (0.40, 1.60),
-    "gpt-4.1-nano": (0.10, 0.40),
-    "gpt-4o": (2.50, 10.00),
-    "gpt-4o-mini": (0.15, 0.60),
-    "o3": (2.00, 8.00),
-    "o3-mini": (1.10, 4.40),
-    "o4-mini": (1.10, 4.40),
-    "o1": (15.00, 60.00),
-    "o1-mini": (3.00, 12.00),
-    # OpenAI — legacy
-    "gpt-4-turbo": (10.00, 30.00),
-    "gpt-4": (30.00, 60.00),
-    "gpt-3.5-turbo": (0.50, 1.50),
-    # Anthropic — latest
-    "claude-opus-4-6": (5.00, 25.00),
-    "claude-sonnet-4-6": (3.00, 15.00),
-    "claude-haiku-4-5-20251001": (1.00, 5.00),
-    # Anthropic — legacy
-    "claude-sonnet-4-5-20250929": (3.00, 15.00),
-    "claude-sonnet-4-20250514": (3.00, 15.00),
-    "claude-3-5-sonnet-20241022": (3.00, 15.00),
-    "claude-3-5-haiku-20241022": (1.00, 5.00),
-    "claude-3-opus-20240229": (15.00, 75.00),
-    "claude-3-haiku-20240307": (0.25, 1.25),
-    # Google Gemini — latest
-    "gemini-2.5-pro": (1.25, 10.00),
-    "gemini-2.5-flash": (0.15, 0.60),
-    "gemini-2.0-flash-lite": (0.075, 0.30),
-    "gemini-2.0-flash": (0.10, 0.40),
-    # Google Gemini — legacy
-    "gemini-1.5-pro": (1.25, 5.00),
-    "gemini-1.5-flash": (0.075, 0.30),
-}
+# Wrapped in MappingProxyType so callers cannot mutate the shared table.
+PRICE_TABLE: Mapping[str, tuple[float, float]] = MappingProxyType(
+    {
+        # OpenAI — latest
+        "gpt-4.1": (2.00, 8.00),
+        "gpt-4.1-mini": (0.40, 1.60),
+        "gpt-4.1-nano": (0.10, 0.40),
+        "gpt-4o": (2.50, 10.00),
+        "gpt-4o-mini": (0.15, 0.60),
+        "o3": (2.00, 8.00),
+        "o3-mini": (1.10, 4.40),
+        "o4-mini": (1.10, 4.40),
+        "o1": (15.00, 60.00),
+        "o1-mini": (3.00, 12.00),
+        # OpenAI — legacy
+        "gpt-4-turbo": (10.00, 30.00),
+        "gpt-4": (30.00, 60.00),
+        "gpt-3.5-turbo": (0.50, 1.50),
+        # Anthropic — latest
+        "claude-opus-4-6": (5.00, 25.00),
+        "claude-sonnet-4-6": (3.00, 15.00),
+        "claude-haiku-4-5-20251001": (1.00, 5.00),
+        # Anthropic — legacy
+        "claude-sonnet-4-5-20250929": (3.00, 15.00),
+        "claude-sonnet-4-20250514": (3.00, 15.00),
+        "claude-3-5-sonnet-20241022": (3.00, 15.00),
+        "claude-3-5-haiku-20241022": (1.00, 5.00),
+        "claude-3-opus-20240229": (15.00, 75.00),
+        "claude-3-haiku-20240307": (0.25, 1.25),
+        # Google Gemini — latest
+        "gemini-2.5-pro": (1.25, 10.00),
+        "gemini-2.5-flash": (0.15, 0.60),
+        "gemini-2.0-flash-lite": (0.075, 0.30),
+        "gemini-2.0-flash": (0.10, 0.40),
+        # Google Gemini — legacy
+        "gemini-1.5-pro": (1.25, 5.00),
+        "gemini-1.5-flash": (0.075, 0.30),
+    }
+)
+
+# Model → provider mapping (read-only, like PRICE_TABLE)
+MODEL_PROVIDER: Mapping[str, str] = MappingProxyType(
+    {
+        # OpenAI
+        "gpt-4.1": "openai",
+        "gpt-4.1-mini": "openai",
+        "gpt-4.1-nano": "openai",
+        "gpt-4o": "openai",
+        "gpt-4o-mini": "openai",
+        "o3": "openai",
+        "o3-mini": "openai",
+        "o4-mini": "openai",
+        "o1": "openai",
+        "o1-mini": "openai",
+        "gpt-4-turbo": "openai",
+        "gpt-4": "openai",
+        "gpt-3.5-turbo": "openai",
+        # Anthropic
+        "claude-opus-4-6": "anthropic",
+        "claude-sonnet-4-6": "anthropic",
+        "claude-haiku-4-5-20251001": "anthropic",
+        "claude-sonnet-4-5-20250929": "anthropic",
+        "claude-sonnet-4-20250514": "anthropic",
+        "claude-3-5-sonnet-20241022": "anthropic",
+        "claude-3-5-haiku-20241022": "anthropic",
+        "claude-3-opus-20240229": "anthropic",
+        "claude-3-haiku-20240307": "anthropic",
+        # Google Gemini
+        "gemini-2.5-pro": "google",
+        "gemini-2.5-flash": "google",
+        "gemini-2.0-flash-lite": "google",
+        "gemini-2.0-flash": "google",
+        "gemini-1.5-pro": "google",
+        "gemini-1.5-flash": "google",
+    }
+)
+
+# Model → context window in tokens (read-only, same keys as PRICE_TABLE).
+# Used to reject oversized prompts before a provider call is made.
+CONTEXT_WINDOW: Mapping[str, int] = MappingProxyType(
+    {
+        # OpenAI
+        "gpt-4.1": 1_047_576,
+        "gpt-4.1-mini": 1_047_576,
+        "gpt-4.1-nano": 1_047_576,
+        "gpt-4o": 128_000,
+        "gpt-4o-mini": 128_000,
+        "o3": 200_000,
+        "o3-mini": 200_000,
+        "o4-mini": 200_000,
+        "o1": 200_000,
+        "o1-mini": 128_000,
+        "gpt-4-turbo": 128_000,
+        "gpt-4": 8_192,
+        "gpt-3.5-turbo": 16_385,
+        # Anthropic
+        "claude-opus-4-6": 200_000,
+        "claude-sonnet-4-6": 200_000,
+        "claude-haiku-4-5-20251001": 200_000,
+        "claude-sonnet-4-5-20250929": 200_000,
+        "claude-sonnet-4-20250514": 200_000,
+        "claude-3-5-sonnet-20241022": 200_000,
+        "claude-3-5-haiku-20241022": 200_000,
+        "claude-3-opus-20240229": 200_000,
+        "claude-3-haiku-20240307": 200_000,
+        # Google Gemini
+        "gemini-2.5-pro": 1_048_576,
+        "gemini-2.5-flash": 1_048_576,
+        "gemini-2.0-flash-lite": 1_048_576,
+        "gemini-2.0-flash": 1_048_576,
+        "gemini-1.5-pro": 2_097_152,
+        "gemini-1.5-flash": 1_048_576,
+    }
+)
 
-# Model → provider mapping
-MODEL_PROVIDER: dict[str, str] = {
-    # OpenAI
-    "gpt-4.1": "openai",
-    "gpt-4.1-mini": "openai",
-    "gpt-4.1-nano": "openai",
-    "gpt-4o": "openai",
-    "gpt-4o-mini": "openai",
-    "o3": "openai",
-    "o3-mini": "openai",
-    "o4-mini": "openai",
-    "o1": "openai",
-    "o1-mini": "openai",
-    "gpt-4-turbo": "openai",
-    "gpt-4": "openai",
-    "gpt-3.5-turbo": "openai",
-    # Anthropic
-    "claude-opus-4-6": "anthropic",
-    "claude-sonnet-4-6": "anthropic",
-    "claude-haiku-4-5-20251001": "anthropic",
-    "claude-sonnet-4-5-20250929": "anthropic",
-    "claude-sonnet-4-20250514": "anthropic",
-    "claude-3-5-sonnet-20241022": "anthropic",
-    "claude-3-5-haiku-20241022": "anthropic",
-    "claude-3-opus-20240229": "anthropic",
-    "claude-3-haiku-20240307": "anthropic",
-    # Google Gemini
-    "gemini-2.5-pro": "google",
-    "gemini-2.5-flash": "google",
-    "gemini-2.0-flash-lite": "google",
-    "gemini-2.0-flash": "google",
-    "gemini-1.5-pro": "google",
-    "gemini-1.5-flash": "google",
-}
+
+_price_for = PRICE_TABLE.get
+
+# Fraction of the input price charged for prompt-cache reads.
+CACHED_INPUT_RATE: Mapping[str, float] = MappingProxyType(
+    {
+        "openai": 0.25,
+        "anthropic": 0.10,
+        "google": 0.25,
+    }
+)
 
 
-def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
-    """Estimate cost in USD using per-million-token pricing."""
-    prices = PRICE_TABLE.get(model)
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+) -> float:
+    """Estimate cost in USD using per-million-token pricing.
+
+    ``cached_tokens`` is the part of ``input_tokens`` served from the
+    provider's prompt cache and is billed at the discounted cache-read rate.
+    """
+    prices = _price_for(model)
     if prices is None:
         return 0.0
     input_cost, output_cost = prices
-    return (input_tokens / 1_000_000) * input_cost + (
+    cost = (input_tokens / 1_000_000) * input_cost + (
         output_tokens / 1_000_000
     ) * output_cost
+    if cached_tokens:
+        discount = 1.0 - CACHED_INPUT_RATE[provider_for_model(model)]
+        cost -= (cached_tokens / 1_000_000) * input_cost * discount
+    return cost
 
 
+@functools.lru_cache(maxsize=256)
 def provider_for_model(model: str) -> str:
     """Return 'openai', 'anthropic', or 'google' based on the model name."""
     if model in MODEL_PROVIDER:
@@ -111,16 +189,118 @@ def provider_for_model(model: str) -> str:
     raise ValueError(f"Unknown model: {model}")
 
 
+# ---------------------------------------------------------------------------
+# Connection warm-up
+# ---------------------------------------------------------------------------
+
+# Base URL per provider, used to pre-establish the TLS session on startup.
+_PROVIDER_BASE_URL: dict[str, str] = {
+    "openai": "https://api.openai.com",
+    "anthropic": "https://api.anthropic.com",
+    "google": "https://generativelanguage.googleapis.com",
+}
+
+
+async def warmup(provider: str) -> None:
+    """Open a connection to *provider* so the first real call skips the handshake.
+
+    Failures are logged and ignored — warm-up is purely an optimization.
+    """
+    base_url = _PROVIDER_BASE_URL.get(provider)
+    if base_url is None:
+        raise ValueError(f"Unsupported provider: {provider}")
+    try:
+        await get_client().head(base_url, timeout=5.0)
+    except httpx.HTTPError:
+        logger.debug("Connection warm-up failed for %s", provider, exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching
+# ---------------------------------------------------------------------------
+
+# Anthropic only caches prefixes of at least ~1024 tokens; at roughly four
+# characters per token, shorter blocks are not worth a cache breakpoint.
+_ANTHROPIC_CACHE_MIN_CHARS = 4096
+
+_EPHEMERAL_CACHE: dict[str, str] = {"type": "ephemeral"}
+
+
+def _cached_text_block(text: str) -> list[dict[str, Any]]:
+    """Wrap *text* in a content block carrying an Anthropic cache breakpoint."""
+    return [{"type": "text", "text": text, "cache_control": _EPHEMERAL_CACHE}]
+
+
+def _anthropic_payload(
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    max_tokens: int | None,
+) -> dict[str, Any]:
+    """Build a messages API payload, adding cache breakpoints to long prefixes."""
+    # Extract system message from the messages list
+    system_text: str | None = None
+    anthropic_messages: list[dict[str, Any]] = []
+    user_marked = False
+    for msg in messages:
+        if msg.get("role") == "system":
+            system_text = msg.get("content", "")
+            continue
+        content = msg.get("content", "")
+        if (
+            not user_marked
+            and msg.get("role") == "user"
+            and len(content) >= _ANTHROPIC_CACHE_MIN_CHARS
+        ):
+            anthropic_messages.append(
+                {"role": "user", "content": _cached_text_block(content)}
+            )
+            user_marked = True
+        else:
+            anthropic_messages.append(msg)
+
+    payload: dict[str, Any] = {
+        "model": model,
+        "messages": anthropic_messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens or 4096,
+    }
+    if system_text is not None:
+        if len(system_text) >= _ANTHROPIC_CACHE_MIN_CHARS:
+            payload["system"] = _cached_text_block(system_text)
+        else:
+            payload["system"] = system_text
+    return payload
+
+
+def _anthropic_input_usage(usage: dict[str, Any]) -> tuple[int, int]:
+    """Return (input_tokens, cached_tokens) from an Anthropic usage block.
+
+    Anthropic reports cache reads and writes separately from ``input_tokens``;
+    fold them back in so input counts match the other providers.
+    """
+    cached_tokens: int = usage.get("cache_read_input_tokens") or 0
+    input_tokens: int = (
+        usage.get("input_tokens", 0)
+        + cached_tokens
+        + (usage.get("cache_creation_input_tokens") or 0)
+    )
+    return input_tokens, cached_tokens
+
+
 async def call_openai(
     api_key: str,
     model: str,
     messages: list[dict[str, str]],
     temperature: float = 1.0,
     max_tokens: int | None = None,
-) -> tuple[str, int, int]:
+) -> tuple[str, int, int, int]:
     """Call OpenAI chat completions API.
 
-    Returns (completion, input_tokens, output_tokens).
+    OpenAI caches long prompt prefixes automatically; the cached share of
+    the prompt is reported back in ``usage.prompt_tokens_details``.
+
+    Returns (completion, input_tokens, output_tokens, cached_tokens).
     """
     if not api_key:
         raise ValueError("OpenAI API key is not configured")
@@ -133,19 +313,18 @@ async def call_openai(
     if max_tokens is not None:
         payload["max_tokens"] = max_tokens
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        if not response.is_success:
-            error_body = response.text[:200]  # Truncate to avoid leaking sensitive info
-            raise ValueError(f"OpenAI API error {response.status_code}: {error_body}")
-        data = response.json()
+    response = await get_client().post(
+        "https://api.openai.com/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    )
+    if not response.is_success:
+        error_body = response.text[:200]  # Truncate to avoid leaking sensitive info
+        raise ValueError(f"OpenAI API error {response.status_code}: {error_body}")
+    data = response.json()
 
     choices = data.get("choices")
     if not choices or not isinstance(choices, list):
@@ -154,7 +333,10 @@ async def call_openai(
     usage = data.get("usage", {})
     input_tokens: int = usage.get("prompt_tokens", 0)
     output_tokens: int = usage.get("completion_tokens", 0)
-    return completion_text, input_tokens, output_tokens
+    cached_tokens: int = (usage.get("prompt_tokens_details") or {}).get(
+        "cached_tokens", 0
+    )
+    return completion_text, input_tokens, output_tokens, cached_tokens
 
 
 async def call_anthropic(
@@ -163,48 +345,34 @@ async def call_anthropic(
     messages: list[dict[str, str]],
     temperature: float = 1.0,
     max_tokens: int | None = None,
-) -> tuple[str, int, int]:
+) -> tuple[str, int, int, int]:
     """Call Anthropic messages API.
 
-    Returns (completion, input_tokens, output_tokens).
+    A long system prompt and the first long user message are marked with
+    ``cache_control`` so repeated replays and compare turns read them from
+    Anthropic's prompt cache instead of paying full input price.
+
+    Returns (completion, input_tokens, output_tokens, cached_tokens), where
+    ``input_tokens`` includes the cached and cache-written tokens.
     """
     if not api_key:
         raise ValueError("Anthropic API key is not configured")
 
-    # Extract system message from the messages list
-    system_text: str | None = None
-    anthropic_messages: list[dict[str, str]] = []
-    for msg in messages:
-        if msg.get("role") == "system":
-            system_text = msg.get("content", "")
-        else:
-            anthropic_messages.append(msg)
+    payload = _anthropic_payload(model, messages, temperature, max_tokens)
 
-    payload: dict[str, Any] = {
-        "model": model,
-        "messages": anthropic_messages,
-        "temperature": temperature,
-        "max_tokens": max_tokens or 4096,
-    }
-    if system_text is not None:
-        payload["system"] = system_text
-
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        if not response.is_success:
-            error_body = response.text[:200]  # Truncate to avoid leaking sensitive info
-            raise ValueError(
-                f"Anthropic API error {response.status_code}: {error_body}"
-            )
-        data = response.json()
+    response = await get_client().post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    )
+    if not response.is_success:
+        error_body = response.text[:200]  # Truncate to avoid leaking sensitive info
+        raise ValueError(f"Anthropic API error {response.status_code}: {error_body}")
+    data = response.json()
 
     content_blocks: list[dict[str, Any]] = data.get("content", [])
     completion_text = ""
@@ -212,10 +380,9 @@ async def call_anthropic(
         if block.get("type") == "text":
             completion_text += block.get("text", "")
 
-    usage = data.get("usage", {})
-    input_tokens: int = usage.get("input_tokens", 0)
-    output_tokens: int = usage.get("output_tokens", 0)
-    return completion_text, input_tokens, output_tokens
+    input_tokens, cached_tokens = _anthropic_input_usage(data.get("usage", {}))
+    output_tokens: int = data.get("usage", {}).get("output_tokens", 0)
+    return completion_text, input_tokens, output_tokens, cached_tokens
 
 
 async def call_google(
@@ -224,10 +391,10 @@ async def call_google(
     messages: list[dict[str, str]],
     temperature: float = 1.0,
     max_tokens: int | None = None,
-) -> tuple[str, int, int]:
+) -> tuple[str, int, int, int]:
     """Call Google Gemini generateContent API.
 
-    Returns (completion, input_tokens, output_tokens).
+    Returns (completion, input_tokens, output_tokens, cached_tokens).
     """
     if not api_key:
         raise ValueError("Google API key is not configured")
@@ -260,19 +427,18 @@ async def call_google(
 
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            url,
-            headers={
-                "x-goog-api-key": api_key,
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        if not response.is_success:
-            error_body = response.text[:200]
-            raise ValueError(f"Google API error {response.status_code}: {error_body}")
-        data = response.json()
+    response = await get_client().post(
+        url,
+        headers={
+            "x-goog-api-key": api_key,
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    )
+    if not response.is_success:
+        error_body = response.text[:200]
+        raise ValueError(f"Google API error {response.status_code}: {error_body}")
+    data = response.json()
 
     candidates = data.get("candidates", [])
     if not candidates:
@@ -284,7 +450,133 @@ async def call_google(
     usage = data.get("usageMetadata", {})
     input_tokens: int = usage.get("promptTokenCount", 0)
     output_tokens: int = usage.get("candidatesTokenCount", 0)
-    return completion_text, input_tokens, output_tokens
+    cached_tokens: int = usage.get("cachedContentTokenCount", 0)
+    return completion_text, input_tokens, output_tokens, cached_tokens
+
+
+# ---------------------------------------------------------------------------
+# Streaming variants (used by playground chat)
+# ---------------------------------------------------------------------------
+
+# (input_tokens, output_tokens, cached_tokens), reported once per stream
+StreamUsage = tuple[int, int, int]
+
+
+async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[dict[str, Any]]:
+    """Yield the decoded JSON payload of each server-sent ``data:`` line."""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        yield json_utils.loads(data)
+
+
+async def stream_openai(
+    api_key: str,
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float = 1.0,
+    max_tokens: int | None = None,
+) -> AsyncIterator[tuple[str, StreamUsage | None]]:
+    """Stream an OpenAI chat completion.
+
+    Yields (delta_text, None) per content chunk and ("", usage) once the
+    final usage chunk arrives.
+    """
+    if not api_key:
+        raise ValueError("OpenAI API key is not configured")
+
+    payload: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+
+    async with get_client().stream(
+        "POST",
+        "https://api.openai.com/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    ) as response:
+        if not response.is_success:
+            error_body = (await response.aread()).decode(errors="replace")[:200]
+            raise ValueError(f"OpenAI API error {response.status_code}: {error_body}")
+        async for event in _iter_sse_data(response):
+            for choice in event.get("choices") or []:
+                delta: str | None = (choice.get("delta") or {}).get("content")
+                if delta:
+                    yield delta, None
+            usage = event.get("usage")
+            if usage:
+                cached_tokens: int = (usage.get("prompt_tokens_details") or {}).get(
+                    "cached_tokens", 0
+                )
+                yield "", (
+                    usage.get("prompt_tokens", 0),
+                    usage.get("completion_tokens", 0),
+                    cached_tokens,
+                )
+
+
+async def stream_anthropic(
+    api_key: str,
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float = 1.0,
+    max_tokens: int | None = None,
+) -> AsyncIterator[tuple[str, StreamUsage | None]]:
+    """Stream an Anthropic message.
+
+    Yields (delta_text, None) per text delta and ("", usage) once the
+    closing ``message_delta`` event reports output tokens.
+    """
+    if not api_key:
+        raise ValueError("Anthropic API key is not configured")
+
+    payload = _anthropic_payload(model, messages, temperature, max_tokens)
+    payload["stream"] = True
+
+    input_tokens = 0
+    cached_tokens = 0
+    async with get_client().stream(
+        "POST",
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    ) as response:
+        if not response.is_success:
+            error_body = (await response.aread()).decode(errors="replace")[:200]
+            raise ValueError(
+                f"Anthropic API error {response.status_code}: {error_body}"
+            )
+        async for event in _iter_sse_data(response):
+            event_type = event.get("type")
+            if event_type == "message_start":
+                usage = event.get("message", {}).get("usage", {})
+                input_tokens, cached_tokens = _anthropic_input_usage(usage)
+            elif event_type == "content_block_delta":
+                delta = event.get("delta", {})
+                if delta.get("type") == "text_delta" and delta.get("text"):
+                    yield delta["text"], None
+            elif event_type == "message_delta":
+                output_tokens: int = event.get("usage", {}).get("output_tokens", 0)
+                yield "", (input_tokens, output_tokens, cached_tokens)
+            elif event_type == "error":
+                message = str(event.get("error", {}).get("message", ""))[:200]
+                raise ValueError(f"Anthropic API error: {message}")
 
 
 # ---------------------------------------------------------------------------
@@ -292,7 +584,7 @@ async def call_google(
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class LlmToolResponse:
     """Rich response from an LLM call that may include tool calls."""
 
@@ -327,19 +619,18 @@ async def call_openai_with_tools(
     if tools:
         payload["tools"] = tools
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        if not response.is_success:
-            error_body = response.text[:200]
-            raise ValueError(f"OpenAI API error {response.status_code}: {error_body}")
-        data = response.json()
+    response = await get_client().post(
+        "https://api.openai.com/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    )
+    if not response.is_success:
+        error_body = response.text[:200]
+        raise ValueError(f"OpenAI API error {response.status_code}: {error_body}")
+    data = response.json()
 
     choices = data.get("choices")
     if not choices or not isinstance(choices, list):
@@ -408,22 +699,19 @@ async def call_anthropic_with_tools(
     if tools:
         payload["tools"] = tools
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        if not response.is_success:
-            error_body = response.text[:200]
-            raise ValueError(
-                f"Anthropic API error {response.status_code}: {error_body}"
-            )
-        data = response.json()
+    response = await get_client().post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    )
+    if not response.is_success:
+        error_body = response.text[:200]
+        raise ValueError(f"Anthropic API error {response.status_code}: {error_body}")
+    data = response.json()
 
     content_blocks: list[dict[str, Any]] = data.get("content", [])
     completion_text = ""
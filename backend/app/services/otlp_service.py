@@ -32,13 +32,17 @@ def convert_otlp_to_spans(payload: dict[str, Any]) -> list[SpanCreate]:
                 trace_id = otel_span.get("traceId", "")
                 if not span_id or not trace_id:
                     continue
-                spans.append(_convert_span(otel_span))
+                spans.append(_convert_span(otel_span, span_id, trace_id))
 
     return spans
 
 
-def _convert_span(otel_span: dict[str, Any]) -> SpanCreate:
-    """Convert a single OTEL span dict to a SpanCreate."""
+def _convert_span(otel_span: dict[str, Any], span_id: str, trace_id: str) -> SpanCreate:
+    """Convert a single OTEL span dict to a SpanCreate.
+
+    *span_id* and *trace_id* are passed in because the caller has already
+    read them to filter out spans without IDs.
+    """
     # Timestamps: OTEL uses nanoseconds (as strings), we use epoch seconds (float)
     start_ns = int(otel_span.get("startTimeUnixNano", "0"))
     end_ns = int(otel_span.get("endTimeUnixNano", "0"))
@@ -64,14 +68,18 @@ def _convert_span(otel_span: dict[str, Any]) -> SpanCreate:
     if status == SpanStatus.ERROR and not error_message:
         error_message = otel_status.get("message")
 
-    return SpanCreate(
-        span_id=otel_span.get("spanId", ""),
-        trace_id=otel_span.get("traceId", ""),
-        parent_span_id=otel_span.get("parentSpanId") or None,
+    parent_span_id = otel_span.get("parentSpanId")
+
+    # Every field below is coerced to its schema type here, so skip Pydantic
+    # validation on the ingest hot path.
+    return SpanCreate.model_construct(
+        span_id=str(span_id),
+        trace_id=str(trace_id),
+        parent_span_id=str(parent_span_id) if parent_span_id else None,
         span_type=SpanType(span_type),
-        name=otel_span.get("name", "unknown"),
+        name=str(otel_span.get("name", "unknown")),
         status=status,
-        error_message=error_message,
+        error_message=str(error_message) if error_message is not None else None,
         start_time=start_time,
         end_time=end_time,
         attributes=attributes,
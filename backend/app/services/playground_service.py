@@ -7,8 +7,8 @@ playground interactions are visible in the Debugger tab.
 from __future__ import annotations
 
 import asyncio
-import json
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 from uuid import uuid4
 
@@ -29,32 +29,52 @@ from app.schemas import (
     SpanStatus,
     SpanType,
 )
-from app.services import settings_service, span_service
+from app.services import settings_service, span_service, token_counter
 from app.services.llm_client import (
+    CONTEXT_WINDOW,
+    StreamUsage,
     call_anthropic,
     call_openai,
     estimate_cost,
     provider_for_model,
+    stream_anthropic,
+    stream_openai,
 )
 from app.ws.manager import ws_manager
 
 
-async def _broadcast_span(db: Session, span_data: SpanCreate) -> None:
-    """Ingest a span into the DB and broadcast via WebSocket."""
-    span_service.ingest_spans(db, [span_data])
-    orm_span = span_service.get_span_by_id(db, span_data.span_id)
-    if orm_span is not None:
-        span_dict = span_service.span_to_response(orm_span).model_dump()
-        await ws_manager.broadcast_span(span_dict)
+async def _broadcast_spans(db: Session, spans: list[SpanCreate]) -> None:
+    """Ingest spans in one transaction and broadcast them as one WS frame."""
+    span_service.ingest_spans_bulk(db, spans)
+    span_dicts: list[dict[str, Any]] = [
+        span_service.span_create_to_response(span_data).model_dump()
+        for span_data in spans
+    ]
+    await ws_manager.broadcast_spans(span_dicts)
+
+
+async def _broadcast_pending(span_data: SpanCreate) -> None:
+    """Broadcast an in-flight span via WebSocket without writing it to the DB.
+
+    Child spans are persisted only in their terminal version; the parent span
+    is also written up front by ``_broadcast_trace_created``.
+    """
+    span_dict = span_service.span_create_to_response(span_data).model_dump()
+    await ws_manager.broadcast_span_pending(span_dict)
 
 
-async def _broadcast_trace_created(trace_id: str, name: str, start: float) -> None:
-    """Notify WS clients of a new trace."""
+async def _broadcast_trace_created(db: Session, parent_span: SpanCreate) -> None:
+    """Persist the pending parent span, then notify WS clients of its new trace.
+
+    Writing first means clients that fetch the trace on ``trace_created`` find
+    it instead of getting a 404 while the model calls are still running.
+    """
+    span_service.ingest_spans_bulk(db, [parent_span])
     await ws_manager.broadcast_trace_created(
         {
-            "trace_id": trace_id,
-            "name": name,
-            "start_time": start,
+            "trace_id": parent_span.trace_id,
+            "name": parent_span.name,
+            "start_time": parent_span.start_time,
             "status": "unset",
         }
     )
@@ -65,17 +85,78 @@ async def _call_model(
     api_key: str,
     model: str,
     messages: list[dict[str, str]],
-) -> tuple[str, int, int, float]:
-    """Call a model and return (completion, in_tok, out_tok, latency_ms)."""
-    start = time.monotonic()
+    t0: float,
+) -> tuple[str, int, int, int, float]:
+    """Call a model and return (completion, in_tok, out_tok, cached_tok, latency_ms).
+
+    ``t0`` is the caller's ``time.monotonic()`` reading for the request start.
+    """
     if provider == "openai":
-        completion, in_tok, out_tok = await call_openai(api_key, model, messages)
+        completion, in_tok, out_tok, cached_tok = await call_openai(
+            api_key, model, messages
+        )
     elif provider == "anthropic":
-        completion, in_tok, out_tok = await call_anthropic(api_key, model, messages)
+        completion, in_tok, out_tok, cached_tok = await call_anthropic(
+            api_key, model, messages
+        )
     else:
         raise ValueError(f"Unsupported provider: {provider}")
-    latency_ms = (time.monotonic() - start) * 1000
-    return completion, in_tok, out_tok, latency_ms
+    latency_ms = (time.monotonic() - t0) * 1000
+    return completion, in_tok, out_tok, cached_tok, latency_ms
+
+
+async def _stream_model(
+    provider: str,
+    api_key: str,
+    model: str,
+    messages: list[dict[str, str]],
+    t0: float,
+    on_delta: Callable[[str], Awaitable[None]],
+) -> tuple[str, int, int, int, float]:
+    """Stream a model's reply, passing each text delta to *on_delta*.
+
+    Returns the same (completion, in_tok, out_tok, cached_tok, latency_ms)
+    tuple as _call_model once the stream finishes.
+    """
+    stream: AsyncIterator[tuple[str, StreamUsage | None]]
+    if provider == "openai":
+        stream = stream_openai(api_key, model, messages)
+    elif provider == "anthropic":
+        stream = stream_anthropic(api_key, model, messages)
+    else:
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    parts: list[str] = []
+    in_tok = out_tok = cached_tok = 0
+    async for delta, usage in stream:
+        if delta:
+            parts.append(delta)
+            await on_delta(delta)
+        if usage is not None:
+            in_tok, out_tok, cached_tok = usage
+    latency_ms = (time.monotonic() - t0) * 1000
+    return "".join(parts), in_tok, out_tok, cached_tok, latency_ms
+
+
+# Per-model cap in compare() so one slow provider cannot stall the response
+_COMPARE_TIMEOUT_S = 45.0
+
+
+async def _call_model_with_timeout(
+    provider: str,
+    api_key: str,
+    model: str,
+    messages: list[dict[str, str]],
+    t0: float,
+    timeout: float,
+) -> tuple[str, int, int, int, float]:
+    """Like _call_model, but raise TimeoutError after *timeout* seconds."""
+    try:
+        return await asyncio.wait_for(
+            _call_model(provider, api_key, model, messages, t0), timeout
+        )
+    except TimeoutError:
+        raise TimeoutError(f"{model} timed out after {timeout:g}s") from None
 
 
 def _messages_to_dicts(
@@ -83,12 +164,10 @@ def _messages_to_dicts(
     system_prompt: str | None = None,
 ) -> list[dict[str, str]]:
     """Convert Pydantic PlaygroundMessage list to plain dicts, prepending system."""
-    result: list[dict[str, str]] = []
-    if system_prompt:
-        result.append({"role": "system", "content": system_prompt})
-    for m in messages:
-        result.append({"role": m.role, "content": m.content})
-    return result
+    head: list[dict[str, str]] = (
+        [{"role": "system", "content": system_prompt}] if system_prompt else []
+    )
+    return head + [{"role": m.role, "content": m.content} for m in messages]
 
 
 async def chat(
@@ -106,6 +185,7 @@ async def chat(
     conversation_id = request.conversation_id or str(uuid4())
     trace_id = conversation_id  # 1 trace per conversation
     now = time.time()
+    t0 = time.monotonic()
 
     messages_dicts = _messages_to_dicts(request.messages, request.system_prompt)
 
@@ -124,9 +204,7 @@ async def chat(
 
     # Broadcast trace_created on first message
     if request.conversation_id is None:
-        await _broadcast_trace_created(trace_id, f"Playground: {request.model}", now)
-
-    await _broadcast_span(db, parent_span)
+        await _broadcast_trace_created(db, parent_span)
 
     # Create llm_call child span (start)
     llm_span_id = str(uuid4())
@@ -141,19 +219,29 @@ async def chat(
         attributes={
             "llm.provider": provider,
             "llm.model": request.model,
-            "llm.prompt": json.dumps(messages_dicts),
+            "llm.prompt": messages_dicts,
             "llm.temperature": 1.0,
         },
     )
-    await _broadcast_span(db, llm_span_start)
+    # Announce the in-flight spans while the LLM call runs
+    start_tasks = [
+        asyncio.create_task(_broadcast_pending(span))
+        for span in (parent_span, llm_span_start)
+    ]
+
+    async def _on_delta(delta: str) -> None:
+        # Keep deltas behind the pending frames for the same span
+        await asyncio.gather(*start_tasks)
+        await ws_manager.broadcast_span_delta(llm_span_id, trace_id, delta)
 
-    # Call the LLM
+    # Stream the LLM reply, forwarding text deltas as they arrive
     try:
-        completion, in_tok, out_tok, latency_ms = await _call_model(
-            provider, api_key, request.model, messages_dicts
+        completion, in_tok, out_tok, cached_tok, latency_ms = await _stream_model(
+            provider, api_key, request.model, messages_dicts, t0, _on_delta
         )
     except Exception as exc:
-        end_time = time.time()
+        await asyncio.gather(*start_tasks)
+        end_time = now + (time.monotonic() - t0)
         # Mark spans as ERROR so they don't stay in UNSET forever
         error_span = SpanCreate(
             span_id=llm_span_id,
@@ -168,10 +256,9 @@ async def chat(
             attributes={
                 "llm.provider": provider,
                 "llm.model": request.model,
-                "llm.prompt": json.dumps(messages_dicts),
+                "llm.prompt": messages_dicts,
             },
         )
-        await _broadcast_span(db, error_span)
         parent_err = SpanCreate(
             span_id=parent_span_id,
             trace_id=trace_id,
@@ -184,11 +271,12 @@ async def chat(
             end_time=end_time,
             attributes={"playground": True},
         )
-        await _broadcast_span(db, parent_err)
+        await _broadcast_spans(db, [parent_err, error_span])
         raise
 
-    cost_usd = estimate_cost(request.model, in_tok, out_tok)
-    end_time = time.time()
+    await asyncio.gather(*start_tasks)
+    cost_usd = estimate_cost(request.model, in_tok, out_tok, cached_tok)
+    end_time = now + (time.monotonic() - t0)
 
     # Update llm_call span with response
     llm_span_end = SpanCreate(
@@ -203,17 +291,17 @@ async def chat(
         attributes={
             "llm.provider": provider,
             "llm.model": request.model,
-            "llm.prompt": json.dumps(messages_dicts),
+            "llm.prompt": messages_dicts,
             "llm.completion": completion,
             "llm.tokens.input": in_tok,
             "llm.tokens.output": out_tok,
+            "llm.tokens.cached": cached_tok,
             "llm.tokens.total": in_tok + out_tok,
             "llm.cost_usd": cost_usd,
             "llm.temperature": 1.0,
             "llm.finish_reason": "stop",
         },
     )
-    await _broadcast_span(db, llm_span_end)
 
     # Close parent span
     parent_end = SpanCreate(
@@ -227,7 +315,7 @@ async def chat(
         end_time=end_time,
         attributes={"playground": True},
     )
-    await _broadcast_span(db, parent_end)
+    await _broadcast_spans(db, [parent_end, llm_span_end])
 
     return PlaygroundChatResponse(
         conversation_id=conversation_id,
@@ -250,8 +338,22 @@ async def compare(
     if len(request.models) < 2:
         raise ValueError("Comparison requires at least 2 models")
 
+    # Resolve providers and keys (one lookup per distinct provider)
+    providers = [provider_for_model(model) for model in request.models]
+    api_keys = {p: settings_service.get_api_key(p) for p in set(providers)}
+    model_configs: list[tuple[str, str, str]] = []  # (model, provider, key)
+    for model, provider in zip(request.models, providers):
+        api_key = api_keys[provider]
+        if not api_key:
+            raise ValueError(
+                f"No API key configured for {provider} (needed by {model}). "
+                "Add one in Settings."
+            )
+        model_configs.append((model, provider, api_key))
+
     trace_id = str(uuid4())
     now = time.time()
+    t0 = time.monotonic()
     messages_dicts = _messages_to_dicts(request.messages, request.system_prompt)
 
     # Create parent span
@@ -267,23 +369,12 @@ async def compare(
         start_time=now,
         attributes={"playground": True, "playground.compare": True},
     )
-    await _broadcast_trace_created(trace_id, f"Compare: {model_names}", now)
-    await _broadcast_span(db, parent_span)
+    await _broadcast_trace_created(db, parent_span)
+    await _broadcast_pending(parent_span)
 
-    # Resolve providers and keys
-    model_configs: list[tuple[str, str, str]] = []  # (model, provider, key)
-    for model in request.models:
-        provider = provider_for_model(model)
-        api_key = settings_service.get_api_key(provider)
-        if not api_key:
-            raise ValueError(
-                f"No API key configured for {provider} (needed by {model}). "
-                "Add one in Settings."
-            )
-        model_configs.append((model, provider, api_key))
-
-    # Create start spans for each model
+    # Announce a pending span for each model
     span_ids: list[str] = []
+    start_spans: list[SpanCreate] = []
     for model, provider, _ in model_configs:
         span_id = str(uuid4())
         span_ids.append(span_id)
@@ -298,22 +389,42 @@ async def compare(
             attributes={
                 "llm.provider": provider,
                 "llm.model": model,
-                "llm.prompt": json.dumps(messages_dicts),
+                "llm.prompt": messages_dicts,
                 "llm.temperature": 1.0,
             },
         )
-        await _broadcast_span(db, start_span)
+        start_spans.append(start_span)
+    await asyncio.gather(*(_broadcast_pending(span) for span in start_spans))
+
+    # Call all models in parallel, each bounded by the timeout. The prompt is
+    # identical for every model, so estimate its size once and skip models
+    # whose context window it cannot fit.
+    timeout = request.timeout or _COMPARE_TIMEOUT_S
+    prompt_tokens = token_counter.count_tokens(messages_dicts)
+
+    async def _dispatch(
+        model: str, provider: str, api_key: str
+    ) -> tuple[str, int, int, int, float]:
+        limit = CONTEXT_WINDOW.get(model)
+        if limit is not None and prompt_tokens > limit:
+            raise ValueError(
+                f"Prompt is ~{prompt_tokens} tokens, over the {limit}-token "
+                f"context window of {model}"
+            )
+        return await _call_model_with_timeout(
+            provider, api_key, model, messages_dicts, t0, timeout
+        )
 
-    # Call all models in parallel
     tasks = [
-        _call_model(provider, api_key, model, messages_dicts)
+        _dispatch(model, provider, api_key)
         for model, provider, api_key in model_configs
     ]
     raw_results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Process results and update spans
     results: list[CompareResultItem] = []
-    end_time = time.time()
+    end_spans: list[SpanCreate] = []
+    end_time = now + (time.monotonic() - t0)
 
     for i, (model, provider, _) in enumerate(model_configs):
         raw = raw_results[i]
@@ -332,10 +443,11 @@ async def compare(
                 attributes={
                     "llm.provider": provider,
                     "llm.model": model,
-                    "llm.prompt": json.dumps(messages_dicts),
+                    "llm.prompt": messages_dicts,
                 },
             )
-            await _broadcast_span(db, error_span)
+            end_spans.append(error_span)
+            timed_out = isinstance(raw, TimeoutError)
             results.append(
                 CompareResultItem(
                     model=model,
@@ -345,14 +457,16 @@ async def compare(
                         input_tokens=0,
                         output_tokens=0,
                         cost_usd=0,
-                        latency_ms=0,
+                        latency_ms=(
+                            round((end_time - now) * 1000, 1) if timed_out else 0
+                        ),
                     ),
                 )
             )
             continue
 
-        completion, in_tok, out_tok, latency_ms = raw
-        cost_usd = estimate_cost(model, in_tok, out_tok)
+        completion, in_tok, out_tok, cached_tok, latency_ms = raw
+        cost_usd = estimate_cost(model, in_tok, out_tok, cached_tok)
 
         # Update span with success
         end_span = SpanCreate(
@@ -367,17 +481,18 @@ async def compare(
             attributes={
                 "llm.provider": provider,
                 "llm.model": model,
-                "llm.prompt": json.dumps(messages_dicts),
+                "llm.prompt": messages_dicts,
                 "llm.completion": completion,
                 "llm.tokens.input": in_tok,
                 "llm.tokens.output": out_tok,
+                "llm.tokens.cached": cached_tok,
                 "llm.tokens.total": in_tok + out_tok,
                 "llm.cost_usd": cost_usd,
                 "llm.temperature": 1.0,
                 "llm.finish_reason": "stop",
             },
         )
-        await _broadcast_span(db, end_span)
+        end_spans.append(end_span)
 
         results.append(
             CompareResultItem(
@@ -393,7 +508,7 @@ async def compare(
             )
         )
 
-    # Close parent span
+    # Close parent span; the parent and every model span land in one write
     parent_status = (
         SpanStatus.ERROR
         if any(isinstance(r, Exception) for r in raw_results)
@@ -410,7 +525,7 @@ async def compare(
         end_time=end_time,
         attributes={"playground": True, "playground.compare": True},
     )
-    await _broadcast_span(db, parent_end)
+    await _broadcast_spans(db, [parent_end, *end_spans])
 
     return PlaygroundCompareResponse(trace_id=trace_id, results=results)
 
@@ -434,6 +549,7 @@ async def compare_prompts(
     trace_id = str(uuid4())
     test_id = str(uuid4())
     now = time.time()
+    t0 = time.monotonic()
 
     # Create parent span
     parent_span_id = str(uuid4())
@@ -447,10 +563,10 @@ async def compare_prompts(
         start_time=now,
         attributes={"playground": True, "playground.ab_test": True},
     )
-    await _broadcast_trace_created(trace_id, f"A/B Test: {request.model}", now)
-    await _broadcast_span(db, parent_span)
+    await _broadcast_trace_created(db, parent_span)
+    await _broadcast_pending(parent_span)
 
-    # Create start spans for each prompt
+    # Announce a pending span for each prompt
     span_ids: list[str] = []
     messages_per_prompt: list[list[dict[str, str]]] = []
     for i, prompt_text in enumerate(request.prompts):
@@ -472,22 +588,23 @@ async def compare_prompts(
             attributes={
                 "llm.provider": provider,
                 "llm.model": request.model,
-                "llm.prompt": json.dumps(msgs),
+                "llm.prompt": messages_per_prompt[i],
                 "llm.temperature": 1.0,
             },
         )
-        await _broadcast_span(db, start_span)
+        await _broadcast_pending(start_span)
 
     # Call model for all prompts in parallel
     tasks = [
-        _call_model(provider, api_key, request.model, msgs)
+        _call_model(provider, api_key, request.model, msgs, t0)
         for msgs in messages_per_prompt
     ]
     raw_results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Process results and update spans
     results: list[PromptCompareResultItem] = []
-    end_time = time.time()
+    end_spans: list[SpanCreate] = []
+    end_time = now + (time.monotonic() - t0)
 
     for i, prompt_text in enumerate(request.prompts):
         raw = raw_results[i]
@@ -505,10 +622,10 @@ async def compare_prompts(
                 attributes={
                     "llm.provider": provider,
                     "llm.model": request.model,
-                    "llm.prompt": json.dumps(messages_per_prompt[i]),
+                    "llm.prompt": messages_per_prompt[i],
                 },
             )
-            await _broadcast_span(db, error_span)
+            end_spans.append(error_span)
             results.append(
                 PromptCompareResultItem(
                     prompt=prompt_text,
@@ -523,8 +640,8 @@ async def compare_prompts(
             )
             continue
 
-        completion, in_tok, out_tok, latency_ms = raw
-        cost_usd = estimate_cost(request.model, in_tok, out_tok)
+        completion, in_tok, out_tok, cached_tok, latency_ms = raw
+        cost_usd = estimate_cost(request.model, in_tok, out_tok, cached_tok)
 
         end_span = SpanCreate(
             span_id=span_ids[i],
@@ -538,17 +655,18 @@ async def compare_prompts(
             attributes={
                 "llm.provider": provider,
                 "llm.model": request.model,
-                "llm.prompt": json.dumps(messages_per_prompt[i]),
+                "llm.prompt": messages_per_prompt[i],
                 "llm.completion": completion,
                 "llm.tokens.input": in_tok,
                 "llm.tokens.output": out_tok,
+                "llm.tokens.cached": cached_tok,
                 "llm.tokens.total": in_tok + out_tok,
                 "llm.cost_usd": cost_usd,
                 "llm.temperature": 1.0,
                 "llm.finish_reason": "stop",
             },
         )
-        await _broadcast_span(db, end_span)
+        end_spans.append(end_span)
 
         results.append(
             PromptCompareResultItem(
@@ -580,7 +698,7 @@ async def compare_prompts(
         end_time=end_time,
         attributes={"playground": True, "playground.ab_test": True},
     )
-    await _broadcast_span(db, parent_end)
+    await _broadcast_spans(db, [parent_end, *end_spans])
 
     return PlaygroundComparePromptsResponse(
         trace_id=trace_id, test_id=test_id, results=results
@@ -3,6 +3,7 @@ from __future__ import annotations
 import time
 from uuid import uuid4
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app import models
@@ -15,13 +16,24 @@ def list_versions(db: Session, span_id: str) -> list[PromptVersionResponse]:
     if span is None:
         raise ValueError("Span not found")
 
-    rows = (
-        db.query(models.PromptVersion)
-        .filter(models.PromptVersion.span_id == span_id)
-        .order_by(models.PromptVersion.created_at.desc())
-        .all()
+    # Select plain columns and skip Pydantic validation: rows come from our
+    # own table and already match the response schema.
+    version = models.PromptVersion
+    stmt = (
+        select(
+            version.version_id,
+            version.span_id,
+            version.prompt_text,
+            version.label,
+            version.created_at,
+        )
+        .where(version.span_id == span_id)
+        .order_by(version.created_at.desc())
     )
-    return [PromptVersionResponse.model_validate(r) for r in rows]
+    return [
+        PromptVersionResponse.model_construct(**row._mapping)
+        for row in db.execute(stmt)
+    ]
 
 
 def create_version(
@@ -37,14 +49,15 @@ def create_version(
     if span.span_type != "llm_call":
         raise ValueError("Prompt versions only supported for llm_call spans")
 
-    version = models.PromptVersion(
-        version_id=str(uuid4()),
-        span_id=span_id,
-        prompt_text=prompt_text,
-        label=label,
-        created_at=time.time(),
-    )
-    db.add(version)
+    values = {
+        "version_id": str(uuid4()),
+        "span_id": span_id,
+        "prompt_text": prompt_text,
+        "label": label,
+        "created_at": time.time(),
+    }
+    # Core insert: we already hold every column, so skip the ORM unit of
+    # work and the refresh SELECT.
+    db.execute(insert(models.PromptVersion).values(**values))
     db.commit()
-    db.refresh(version)
-    return PromptVersionResponse.model_validate(version)
+    return PromptVersionResponse(**values)
@@ -1,22 +1,51 @@
 from __future__ import annotations
 
-import json
 import os
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 from uuid import uuid4
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app import models
 from app.schemas import ReplayDiff, ReplayResponse
-from app.services import prompt_version_service, settings_service
+from app.services import llm_cache, prompt_version_service, settings_service
 from app.services.llm_client import (
     call_anthropic,
     call_google,
     call_openai,
     estimate_cost,
 )
+from app.utils import json as json_utils
+
+_ProviderCall = Callable[
+    [str, str, list[dict[str, str]], float, int | None],
+    Awaitable[tuple[str, int, int, int]],
+]
+
+_PROVIDERS: dict[str, _ProviderCall] = {
+    "openai": call_openai,
+    "anthropic": call_anthropic,
+    "google": call_google,
+}
+
+# Environment variables checked (in order) before falling back to config.json
+_ENV_KEYS: dict[str, tuple[str, ...]] = {
+    "openai": ("OPENAI_API_KEY",),
+    "anthropic": ("ANTHROPIC_API_KEY",),
+    "google": ("GOOGLE_API_KEY", "GEMINI_API_KEY"),
+}
+
+
+def _resolve_api_key(provider: str) -> str:
+    """Use env-var keys first, fall back to config.json keys."""
+    for env_var in _ENV_KEYS[provider]:
+        key = os.environ.get(env_var, "")
+        if key:
+            return key
+    return settings_service.get_api_key(provider) or ""
 
 
 async def replay_llm_call(
@@ -32,50 +61,40 @@ async def replay_llm_call(
     if span.span_type != "llm_call":
         raise ValueError("Replay only supported for llm_call spans")
 
-    original_attrs: dict[str, Any] = json.loads(span.attributes or "{}")
+    original_attrs: dict[str, Any] = span.attributes or {}
     merged_attrs = {**original_attrs, **modified_attributes}
 
     provider: str = merged_attrs.get("llm.provider", "")
+    handler = _PROVIDERS.get(provider)
+    if handler is None:
+        raise ValueError(f"Unsupported provider: {provider}")
     prompt_raw = merged_attrs.get("llm.prompt", "[]")
     messages: list[dict[str, str]] = (
-        json.loads(prompt_raw) if isinstance(prompt_raw, str) else prompt_raw
+        json_utils.loads(prompt_raw) if isinstance(prompt_raw, str) else prompt_raw
     )
     model: str = merged_attrs.get("llm.model", "")
     temperature: float = float(merged_attrs.get("llm.temperature", 1.0))
     max_tokens_raw = merged_attrs.get("llm.max_tokens")
     max_tokens: int | None = int(max_tokens_raw) if max_tokens_raw is not None else None
 
-    # Use env-var keys first, fall back to config.json keys
-    if provider == "openai":
-        api_key = (
-            os.environ.get("OPENAI_API_KEY", "")
-            or settings_service.get_api_key("openai")
-            or ""
-        )
-        new_completion, input_tokens, output_tokens = await call_openai(
-            api_key, model, messages, temperature, max_tokens
-        )
-    elif provider == "anthropic":
-        api_key = (
-            os.environ.get("ANTHROPIC_API_KEY", "")
-            or settings_service.get_api_key("anthropic")
-            or ""
-        )
-        new_completion, input_tokens, output_tokens = await call_anthropic(
-            api_key, model, messages, temperature, max_tokens
-        )
-    elif provider == "google":
-        api_key = (
-            os.environ.get("GOOGLE_API_KEY", "")
-            or os.environ.get("GEMINI_API_KEY", "")
-            or settings_service.get_api_key("google")
-            or ""
-        )
-        new_completion, input_tokens, output_tokens = await call_google(
-            api_key, model, messages, temperature, max_tokens
+    cache_key: str | None = None
+    cached: tuple[str, int, int] | None = None
+    if llm_cache.is_cacheable(temperature):
+        cache_key = llm_cache.make_key(
+            provider, model, messages, temperature, max_tokens
         )
+        cached = llm_cache.get(db, cache_key)
+
+    if cached is not None:
+        new_completion, input_tokens, output_tokens = cached
+        cached_tokens = 0
     else:
-        raise ValueError(f"Unsupported provider: {provider}")
+        new_completion, input_tokens, output_tokens, cached_tokens = await handler(
+            _resolve_api_key(provider), model, messages, temperature, max_tokens
+        )
+
+    if cache_key is not None and cached is None:
+        llm_cache.put(db, cache_key, new_completion, input_tokens, output_tokens)
 
     original_completion: str = original_attrs.get("llm.completion", "")
     diff = ReplayDiff(
@@ -84,25 +103,34 @@ async def replay_llm_call(
         changed=original_completion != new_completion,
     )
 
-    cost_usd = estimate_cost(model, input_tokens, output_tokens)
+    # A cache hit made no provider call, so it costs nothing
+    cache_hit = cached is not None
+    cost_usd = (
+        0.0
+        if cache_hit
+        else estimate_cost(model, input_tokens, output_tokens, cached_tokens)
+    )
     new_output: dict[str, Any] = {
         "llm.completion": new_completion,
         "llm.tokens.input": input_tokens,
         "llm.tokens.output": output_tokens,
+        "llm.tokens.cached": cached_tokens,
         "llm.cost_usd": cost_usd,
+        "llm.cache_hit": cache_hit,
     }
 
     replay_id = str(uuid4())
-    replay_run = models.ReplayRun(
-        replay_id=replay_id,
-        original_span_id=span_id,
-        trace_id=span.trace_id,
-        modified_input=json.dumps(modified_attributes),
-        new_output=json.dumps(new_output),
-        diff=json.dumps(diff.model_dump()),
-        created_at=time.time(),
+    db.execute(
+        insert(models.ReplayRun).values(
+            replay_id=replay_id,
+            original_span_id=span_id,
+            trace_id=span.trace_id,
+            modified_input=json_utils.dumps(modified_attributes),
+            new_output=json_utils.dumps(new_output),
+            diff=json_utils.dumps(diff.model_dump()),
+            created_at=time.time(),
+        )
     )
-    db.add(replay_run)
     db.commit()
 
     # Auto-save the modified prompt as a prompt version
@@ -111,7 +139,7 @@ async def replay_llm_call(
         if isinstance(modified_prompt, str):
             prompt_text = modified_prompt
         else:
-            prompt_text = json.dumps(modified_prompt)
+            prompt_text = json_utils.dumps(modified_prompt)
         prompt_version_service.create_version(db, span_id, prompt_text, label="Replay")
 
     return ReplayResponse(
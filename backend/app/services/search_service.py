@@ -2,15 +2,85 @@
 
 from __future__ import annotations
 
-from sqlalchemy import or_, select
+import re
+
+from sqlalchemy import (
+    Text,
+    bindparam,
+    cast,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    union,
+)
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app import models
 from app.schemas import SearchResponse, SearchResultItem
+from app.utils import json as json_utils
 
 MAX_RESULTS = 50
 CONTEXT_LENGTH = 100
 
+# The FTS5 trigram tokenizer cannot match queries shorter than one trigram.
+_FTS_MIN_QUERY_LENGTH = 3
+
+_SNIPPET_SQL = text(
+    "SELECT spans.span_id, snippet(span_fts, -1, '', '', '...', 64) "
+    "FROM span_fts JOIN spans ON spans.rowid = span_fts.rowid "
+    "WHERE span_fts MATCH :match AND spans.span_id IN :span_ids"
+).bindparams(bindparam("span_ids", expanding=True))
+
+# Search statements are built once; each search only binds parameters:
+#   :match          quoted FTS5 phrase
+#   :pattern        LIKE pattern (SQLite LIKE is ASCII case-insensitive)
+#   :pattern_lower  the same pattern lowercased, for the name_lower column
+_FTS_SPAN_IDS = select(models.Span.span_id).where(
+    literal_column("spans.rowid").in_(
+        text("SELECT rowid FROM span_fts WHERE span_fts MATCH :match").columns(
+            literal_column("rowid")
+        )
+    )
+)
+_LIKE_SPAN_IDS = select(models.Span.span_id).where(
+    or_(
+        models.Span.name_lower.like(bindparam("pattern_lower"), escape="\\"),
+        cast(models.Span.attributes, Text).like(bindparam("pattern"), escape="\\"),
+    )
+)
+# Spans belonging to traces whose name matches
+_TRACE_NAME_SPAN_IDS = (
+    select(models.Span.span_id)
+    .join(models.Trace, models.Span.trace_id == models.Trace.trace_id)
+    .where(models.Trace.name.like(bindparam("pattern"), escape="\\"))
+)
+
+
+def _match_statements(
+    span_ids: Select[tuple[str]],
+) -> tuple[Select[tuple[int]], Select[tuple[models.Span]]]:
+    """Build the (count, page) statements over *span_ids* + trace-name matches.
+
+    UNION dedupes in SQL; only the requested page is loaded as ORM rows.
+    """
+    matches = union(span_ids, _TRACE_NAME_SPAN_IDS).subquery()
+    count = select(func.count()).select_from(matches)
+    page = (
+        select(models.Span)
+        .join(matches, models.Span.span_id == matches.c.span_id)
+        .order_by(models.Span.start_time.desc())
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+    )
+    return count, page
+
+
+_FTS_COUNT, _FTS_PAGE = _match_statements(_FTS_SPAN_IDS)
+_LIKE_COUNT, _LIKE_PAGE = _match_statements(_LIKE_SPAN_IDS)
+
 
 def search(
     db: Session,
@@ -21,52 +91,43 @@ def search(
 ) -> SearchResponse:
     """Search spans by name and attributes, traces by name.
 
-    Uses SQLite LIKE for substring matching.  Returns matching spans
-    with a snippet of the matching context.
+    Span name/attribute matches use the ``span_fts`` FTS5 index (falling back
+    to LIKE for queries shorter than three characters, or when the SQLite
+    build is too old for the trigram tokenizer).  Returns matching
+    spans with a snippet of the matching context.
     """
+    if not query.strip():
+        return SearchResponse(results=[], total=0)
+
     escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
     pattern = f"%{escaped}%"
-
-    # Spans matching by name or attributes
-    span_stmt = (
-        select(models.Span)
-        .where(
-            or_(
-                models.Span.name.ilike(pattern, escape="\\"),
-                models.Span.attributes.ilike(pattern, escape="\\"),
-            )
-        )
-        .order_by(models.Span.start_time.desc())
-    )
-
-    # Spans belonging to traces whose name matches
-    trace_name_stmt = (
-        select(models.Span)
-        .join(models.Trace, models.Span.trace_id == models.Trace.trace_id)
-        .where(models.Trace.name.ilike(pattern, escape="\\"))
-        .order_by(models.Span.start_time.desc())
+    use_fts = models.FTS_AVAILABLE and len(query) >= _FTS_MIN_QUERY_LENGTH
+    match = _fts_phrase(query)
+    params = {"match": match, "pattern": pattern, "pattern_lower": pattern.lower()}
+    count_stmt, page_stmt = (
+        (_FTS_COUNT, _FTS_PAGE) if use_fts else (_LIKE_COUNT, _LIKE_PAGE)
     )
 
-    span_results = db.execute(span_stmt).scalars().all()
-    trace_results = db.execute(trace_name_stmt).scalars().all()
+    total = db.execute(count_stmt, params).scalar_one()
+    page_params = {**params, "limit": limit, "offset": offset}
+    page = db.execute(page_stmt, page_params).scalars().all()
 
-    # Deduplicate by span_id while preserving order
-    seen: set[str] = set()
-    all_spans: list[models.Span] = []
-    for span in [*span_results, *trace_results]:
-        if span.span_id not in seen:
-            seen.add(span.span_id)
-            all_spans.append(span)
-
-    total = len(all_spans)
-    page = all_spans[offset : offset + limit]
+    snippets: dict[str, str] = {}
+    if use_fts and page:
+        rows = db.execute(
+            _SNIPPET_SQL, {"match": match, "span_ids": [s.span_id for s in page]}
+        )
+        snippets = {span_id: snippet for span_id, snippet in rows}
 
+    query_lower = query.lower()
+    needle = re.compile(re.escape(query), re.IGNORECASE)
     results = [
         SearchResultItem(
             trace_id=span.trace_id,
             span_id=span.span_id,
             name=span.name,
-            match_context=_extract_context(span, query),
+            match_context=snippets.get(span.span_id)
+            or _extract_context(span, query_lower, needle),
         )
         for span in page
     ]
@@ -74,20 +135,31 @@ def search(
     return SearchResponse(results=results, total=total)
 
 
-def _extract_context(span: models.Span, query: str) -> str:
-    """Extract a snippet of text surrounding the match."""
-    query_lower = query.lower()
+def _fts_phrase(query: str) -> str:
+    """Quote *query* as a single FTS5 phrase so operators are not parsed."""
+    return '"' + query.replace('"', '""') + '"'
 
+
+def _extract_context(
+    span: models.Span, query_lower: str, needle: re.Pattern[str]
+) -> str:
+    """Extract a snippet of text surrounding the match.
+
+    *query_lower* is checked against the stored ``name_lower`` column and
+    *needle* (a case-insensitive pattern compiled once per search) scans the
+    attributes JSON, so no lowercased copy of either is built per span.
+    """
     # Check name first
-    if query_lower in span.name.lower():
+    name_lower = span.name_lower or span.name.lower()
+    if query_lower in name_lower:
         return span.name[:CONTEXT_LENGTH]
 
     # Check attributes
-    attrs = span.attributes or ""
-    idx = attrs.lower().find(query_lower)
-    if idx >= 0:
-        start = max(0, idx - 30)
-        end = min(len(attrs), idx + len(query) + 70)
+    attrs = json_utils.dumps(span.attributes) if span.attributes else ""
+    found = needle.search(attrs)
+    if found:
+        start = max(0, found.start() - 30)
+        end = min(len(attrs), found.end() + 70)
         snippet = attrs[start:end]
         if start > 0:
             snippet = "..." + snippet
@@ -2,33 +2,58 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
 from pathlib import Path
 from typing import Any
 
+from app.utils import json as json_utils
+
 logger = logging.getLogger(__name__)
 
 _CONFIG_PATH = Path.home() / ".beacon" / "config.json"
 
 _SUPPORTED_PROVIDERS = ("openai", "anthropic", "google")
 
+# Parsed config keyed by (path, mtime_ns, size). API keys are looked up on
+# every playground/replay call, so skip the read + parse while the file is
+# unchanged. External edits still bump mtime and are picked up.
+_config_cache: tuple[tuple[Path, int, int], dict[str, Any]] | None = None
+
 
 def _read_config() -> dict[str, Any]:
-    if not _CONFIG_PATH.exists():
+    """Return a private copy of the config; callers may mutate it freely."""
+    global _config_cache
+    try:
+        stat = _CONFIG_PATH.stat()
+    except FileNotFoundError:
         return {}
+    except OSError:
+        logger.warning("Corrupt or unreadable config at %s, resetting", _CONFIG_PATH)
+        return {}
+    cache_key = (_CONFIG_PATH, stat.st_mtime_ns, stat.st_size)
+    if _config_cache is not None and _config_cache[0] == cache_key:
+        return copy.deepcopy(_config_cache[1])
     try:
-        return json.loads(_CONFIG_PATH.read_text())  # type: ignore[no-any-return]
-    except (json.JSONDecodeError, OSError):
+        config: dict[str, Any] = json_utils.loads(_CONFIG_PATH.read_bytes())
+    except (json_utils.JSONDecodeError, OSError):
         logger.warning("Corrupt or unreadable config at %s, resetting", _CONFIG_PATH)
         return {}
+    _config_cache = (cache_key, config)
+    return copy.deepcopy(config)
 
 
 def _write_config(config: dict[str, Any]) -> None:
+    global _config_cache
+    _config_cache = None
     _CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
     _CONFIG_PATH.write_text(json.dumps(config, indent=2))
     os.chmod(_CONFIG_PATH, 0o600)
+    # Prime the cache with what we just wrote so the next read skips the parse
+    stat = _CONFIG_PATH.stat()
+    _config_cache = ((_CONFIG_PATH, stat.st_mtime_ns, stat.st_size), config)
 
 
 def get_api_key(provider: str) -> str | None:
@@ -57,11 +82,14 @@ def delete_api_key(provider: str) -> None:
     _write_config(config)
 
 
+_MAX_MASK_LENGTH = 8
+
+
 def _mask_key(key: str) -> str:
-    """Mask all but the last 4 characters."""
+    """Mask all but the last 4 characters, with at most 8 mask characters."""
     if len(key) <= 4:
         return "****"
-    return "•" * (len(key) - 4) + key[-4:]
+    return "•" * min(len(key) - 4, _MAX_MASK_LENGTH) + key[-4:]
 
 
 def list_providers() -> list[dict[str, Any]]:
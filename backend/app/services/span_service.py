@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app import models
-from app.schemas import SpanCreate, SpanResponse
+from app.schemas import Annotation, SpanCreate, SpanResponse, SpanStatus, SpanType
+from app.utils import json as json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -18,37 +19,90 @@ def ingest_spans(
     db: Session,
     spans: list[SpanCreate],
 ) -> tuple[int, int]:
-    """Process a batch of spans. Returns (accepted, rejected)."""
+    """Process a batch of spans. Returns (accepted, rejected).
+
+    The whole batch is written in one transaction.  If that fails, it is
+    retried span by span inside savepoints so a bad span only rejects itself.
+    """
+    if not spans:
+        return 0, 0
+    try:
+        _write_batch(db, spans)
+        db.commit()
+        return len(spans), 0
+    except Exception:
+        logger.warning("Batch ingest failed, retrying %d spans one by one", len(spans))
+        db.rollback()
+
     accepted = 0
     rejected = 0
     for span_data in spans:
         try:
-            _upsert_trace(db, span_data)
-            db.flush()  # ensure trace exists before inserting span (FK constraint)
-            _upsert_span(db, span_data)
-            db.commit()
+            with db.begin_nested():
+                _write_batch(db, [span_data])
             accepted += 1
         except Exception:
             logger.exception("Failed to ingest span %s", span_data.span_id)
-            db.rollback()
             rejected += 1
+    db.commit()
     return accepted, rejected
 
 
+def ingest_spans_bulk(db: Session, spans: list[SpanCreate]) -> None:
+    """Ingest a batch of spans in a single transaction.
+
+    Unlike ``ingest_spans``, a failure on any span rolls back the whole
+    batch and re-raises.
+    """
+    try:
+        _write_batch(db, spans)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
 def get_span_by_id(db: Session, span_id: str) -> models.Span | None:
-    stmt = select(models.Span).where(models.Span.span_id == span_id)
-    return db.execute(stmt).scalar_one_or_none()
+    return db.execute(_SPAN_BY_ID, {"span_id": span_id}).scalar_one_or_none()
 
 
 def span_to_response(span: models.Span) -> SpanResponse:
-    """Convert an ORM Span to a SpanResponse with computed fields."""
-    attributes: dict[str, Any] = json.loads(span.attributes or "{}")
+    """Convert an ORM Span to a SpanResponse with computed fields.
+
+    Values come straight from our own table, so validation is skipped.
+    """
     end_time: float | None = span.end_time
     start_time: float = span.start_time
     duration_ms: float | None = None
     if end_time is not None:
         duration_ms = (end_time - start_time) * 1000
-    annotations_raw: list[dict[str, Any]] = json.loads(span.annotations or "[]")
+    annotations_raw: list[dict[str, Any]] = json_utils.loads(span.annotations or "[]")
+    return SpanResponse.model_construct(
+        span_id=span.span_id,
+        trace_id=span.trace_id,
+        parent_span_id=span.parent_span_id,
+        span_type=SpanType(span.span_type),
+        name=span.name,
+        status=SpanStatus(span.status or SpanStatus.UNSET),
+        error_message=span.error_message,
+        start_time=start_time,
+        end_time=end_time,
+        duration_ms=duration_ms,
+        attributes=span.attributes or {},
+        annotations=[Annotation.model_construct(**a) for a in annotations_raw],
+        sdk_language=span.sdk_language,
+    )
+
+
+def span_create_to_response(span: SpanCreate) -> SpanResponse:
+    """Build a SpanResponse straight from ingest input, without a DB read.
+
+    Only valid for spans whose stored row is fully determined by *span*
+    (i.e. no annotations have been attached yet).
+    """
+    duration_ms: float | None = None
+    if span.end_time is not None:
+        duration_ms = (span.end_time - span.start_time) * 1000
     return SpanResponse(
         span_id=span.span_id,
         trace_id=span.trace_id,
@@ -57,11 +111,11 @@ def span_to_response(span: models.Span) -> SpanResponse:
         name=span.name,
         status=span.status,
         error_message=span.error_message,
-        start_time=start_time,
-        end_time=end_time,
+        start_time=span.start_time,
+        end_time=span.end_time,
         duration_ms=duration_ms,
-        attributes=attributes,
-        annotations=annotations_raw,
+        attributes=span.attributes,
+        annotations=[],
         sdk_language=span.sdk_language,
     )
 
@@ -73,84 +127,165 @@ def update_span_annotations(
     span = get_span_by_id(db, span_id)
     if span is None:
         return None
-    span.annotations = json.dumps(annotations)
+    span.annotations = json_utils.dumps(annotations)
     db.commit()
     db.refresh(span)
     return span
 
 
-def _upsert_trace(db: Session, span: SpanCreate) -> None:
-    stmt = select(models.Trace).where(models.Trace.trace_id == span.trace_id)
-    trace = db.execute(stmt).scalar_one_or_none()
-
-    cost = 0.0
-    tokens = 0
-    if span.span_type.value == "llm_call":
-        cost = span.attributes.get("llm.cost_usd", 0) or 0.0
-        tokens = span.attributes.get("llm.tokens.total", 0) or 0
-
-    if trace is None:
-        trace = models.Trace(
-            trace_id=span.trace_id,
-            name=span.name,
-            start_time=span.start_time,
-            end_time=span.end_time,
-            span_count=1,
-            status=span.status.value,
-            total_cost_usd=cost,
-            total_tokens=tokens,
-            sdk_language=span.sdk_language,
-            created_at=time.time(),
+# Statements are built once at import and executed with bound parameters, so
+# ingest skips statement construction and always hits the compiled cache.
+_SPAN_BY_ID = select(models.Span).where(models.Span.span_id == bindparam("span_id"))
+_TRACES_BY_ID = select(models.Trace).where(
+    models.Trace.trace_id.in_(bindparam("trace_ids", expanding=True))
+)
+_SPAN_STATE_BY_ID = select(
+    models.Span.span_id,
+    models.Span.status,
+    models.Span.span_type,
+    models.Span.cost_usd,
+    models.Span.tokens_total,
+).where(models.Span.span_id.in_(bindparam("span_ids", expanding=True)))
+
+
+_span_insert = sqlite_insert(models.Span)
+_SPAN_UPSERT = _span_insert.on_conflict_do_update(
+    index_elements=[models.Span.span_id],
+    set_={
+        column: _span_insert.excluded[column]
+        for column in (
+            "status",
+            "error_message",
+            "end_time",
+            "attributes",
+            "cost_usd",
+            "tokens_total",
         )
-        db.add(trace)
-    else:
-        trace.span_count = (trace.span_count or 0) + 1
+    },
+)
+
+
+def _write_batch(db: Session, spans: list[SpanCreate]) -> None:
+    """Upsert *spans* and roll their totals into their traces, without committing.
+
+    Trace rows are loaded once per batch and updated in Python; spans go out
+    as a single ``INSERT ... ON CONFLICT DO UPDATE`` executed for all rows.
+    """
+    now = time.time()
+    trace_ids = list(dict.fromkeys(span.trace_id for span in spans))
+    traces = {
+        trace.trace_id: trace
+        for trace in db.execute(_TRACES_BY_ID, {"trace_ids": trace_ids}).scalars()
+    }
+    # Status and usage already counted for re-sent spans, so traces take deltas
+    counted = {
+        row.span_id: (
+            row.status,
+            *_span_usage(row.span_type, row.cost_usd, row.tokens_total),
+        )
+        for row in db.execute(
+            _SPAN_STATE_BY_ID, {"span_ids": [span.span_id for span in spans]}
+        )
+    }
+
+    for span in spans:
+        trace = traces.get(span.trace_id)
+        if trace is None:
+            trace = models.Trace(
+                trace_id=span.trace_id,
+                name=span.name,
+                start_time=span.start_time,
+                end_time=span.end_time,
+                span_count=0,
+                error_count=0,
+                pending_count=0,
+                total_cost_usd=0.0,
+                total_tokens=0,
+                sdk_language=span.sdk_language,
+                created_at=now,
+            )
+            db.add(trace)
+            traces[span.trace_id] = trace
+        elif span.parent_span_id is None:
+            trace.name = span.name
+
         trace.start_time = min(trace.start_time, span.start_time)
         if span.end_time is not None:
             trace.end_time = max(trace.end_time or 0, span.end_time)
-        if span.parent_span_id is None:
-            trace.name = span.name
-        trace.total_cost_usd = (trace.total_cost_usd or 0) + cost
-        trace.total_tokens = (trace.total_tokens or 0) + tokens
-        trace.status = _compute_trace_status(db, span.trace_id, span)
 
+        status = span.status.value
+        cost, tokens = _span_usage(span.span_type.value, *_llm_metrics(span.attributes))
+        previous = counted.get(span.span_id)
+        if previous is None:
+            trace.span_count = (trace.span_count or 0) + 1
+        else:
+            _count_status(trace, previous[0], -1)
+        _count_status(trace, status, 1)
+        trace.status = _trace_status(trace)
+        prev_cost, prev_tokens = (0.0, 0) if previous is None else previous[1:]
+        trace.total_cost_usd = (trace.total_cost_usd or 0) + cost - prev_cost
+        trace.total_tokens = (trace.total_tokens or 0) + tokens - prev_tokens
+        counted[span.span_id] = (status, cost, tokens)
 
-def _upsert_span(db: Session, span: SpanCreate) -> None:
-    stmt = select(models.Span).where(models.Span.span_id == span.span_id)
-    existing = db.execute(stmt).scalar_one_or_none()
-    now = time.time()
-    if existing is None:
-        db_span = models.Span(
-            span_id=span.span_id,
-            trace_id=span.trace_id,
-            parent_span_id=span.parent_span_id,
-            span_type=span.span_type.value,
-            name=span.name,
-            status=span.status.value,
-            error_message=span.error_message,
-            start_time=span.start_time,
-            end_time=span.end_time,
-            attributes=json.dumps(span.attributes),
-            sdk_language=span.sdk_language,
-            created_at=now,
-        )
-        db.add(db_span)
-    else:
-        existing.status = span.status.value
-        existing.error_message = span.error_message
-        existing.end_time = span.end_time
-        existing.attributes = json.dumps(span.attributes)
+    db.flush()  # ensure traces exist before inserting spans (FK constraint)
+    db.execute(_SPAN_UPSERT, [_span_row(span, now) for span in spans])
 
 
-def _compute_trace_status(db: Session, trace_id: str, new_span: SpanCreate) -> str:
-    """Derive trace status: error > unset > ok."""
-    if new_span.status.value == "error":
-        return "error"
-    stmt = select(models.Span.status).where(models.Span.trace_id == trace_id)
-    statuses = [row[0] for row in db.execute(stmt).all()]
-    statuses.append(new_span.status.value)
-    if "error" in statuses:
+def _count_status(trace: models.Trace, status: str, delta: int) -> None:
+    if status == "error":
+        trace.error_count = (trace.error_count or 0) + delta
+    elif status == "unset":
+        trace.pending_count = (trace.pending_count or 0) + delta
+
+
+def _trace_status(trace: models.Trace) -> str:
+    """Derive trace status from its span counters: error > unset > ok."""
+    if trace.error_count:
         return "error"
-    if "unset" in statuses:
+    if trace.pending_count:
         return "unset"
     return "ok"
+
+
+def _llm_metrics(attributes: dict[str, Any]) -> tuple[float | None, int | None]:
+    """Extract numeric ``llm.cost_usd`` / ``llm.tokens.total`` attributes."""
+    cost = attributes.get("llm.cost_usd")
+    tokens = attributes.get("llm.tokens.total")
+    return (
+        float(cost) if _is_number(cost) else None,
+        int(tokens) if _is_number(tokens) else None,
+    )
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _span_usage(
+    span_type: str, cost: float | None, tokens: int | None
+) -> tuple[float, int]:
+    """Return the (cost, tokens) a span contributes to its trace totals."""
+    if span_type != "llm_call":
+        return 0.0, 0
+    return cost or 0.0, tokens or 0
+
+
+def _span_row(span: SpanCreate, now: float) -> dict[str, Any]:
+    cost, tokens = _llm_metrics(span.attributes)
+    return {
+        "span_id": span.span_id,
+        "trace_id": span.trace_id,
+        "parent_span_id": span.parent_span_id,
+        "span_type": span.span_type.value,
+        "name": span.name,
+        "name_lower": span.name.lower(),
+        "status": span.status.value,
+        "error_message": span.error_message,
+        "start_time": span.start_time,
+        "end_time": span.end_time,
+        "attributes": span.attributes,
+        "cost_usd": cost,
+        "tokens_total": tokens,
+        "sdk_language": span.sdk_language,
+        "created_at": now,
+    }
@@ -0,0 +1,56 @@
+"""Local, approximate token counts for pre-flight checks.
+
+Used to reject prompts that cannot fit a model's context window before a
+provider call is paid for. Counts use ``tiktoken`` when the optional
+``tokens`` extra is installed (``pip install beacon-backend[tokens]``) and
+fall back to a ~4 characters-per-token estimate otherwise. Either way the
+result is an estimate: Anthropic and Google tokenize differently.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.util
+from collections import OrderedDict
+from typing import Any
+
+_TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+
+# Chat formatting overhead per message (role markers, separators)
+_TOKENS_PER_MESSAGE = 4
+_CHARS_PER_TOKEN = 4
+
+# tiktoken counts keyed by (sha256 digest, length) rather than the text itself,
+# so the cache does not pin thousands of full prompts in memory
+_COUNT_CACHE_SIZE = 4096
+_count_cache: OrderedDict[tuple[bytes, int], int] = OrderedDict()
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(name: str) -> Any:
+    import tiktoken
+
+    return tiktoken.get_encoding(name)
+
+
+def _count_text(text: str) -> int:
+    if not _TIKTOKEN_AVAILABLE:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    key = (hashlib.sha256(text.encode()).digest(), len(text))
+    count = _count_cache.get(key)
+    if count is not None:
+        _count_cache.move_to_end(key)
+        return count
+    count = len(_encoding("o200k_base").encode(text, disallowed_special=()))
+    _count_cache[key] = count
+    if len(_count_cache) > _COUNT_CACHE_SIZE:
+        _count_cache.popitem(last=False)
+    return count
+
+
+def count_tokens(messages: list[dict[str, str]]) -> int:
+    """Estimate the prompt tokens for a list of chat messages."""
+    return sum(
+        _TOKENS_PER_MESSAGE + _count_text(msg.get("content", "")) for msg in messages
+    )
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import json
+from typing import Any
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, select
+from sqlalchemy.orm import Session, joinedload
 
 from app import models
 from app.schemas import (
@@ -14,6 +14,7 @@ from app.schemas import (
     GraphNode,
     GraphNodeData,
     SpanStatus,
+    SpanType,
     TraceDetailResponse,
     TracesResponse,
     TraceSummary,
@@ -29,7 +30,7 @@ def list_traces(
     status: SpanStatus | None = None,
 ) -> TracesResponse:
     """Return paginated trace list, newest first."""
-    query = select(models.Trace).order_by(models.Trace.created_at.desc())
+    query = select(*_SUMMARY_COLUMNS).order_by(models.Trace.created_at.desc())
 
     if status:
         query = query.where(models.Trace.status == status)
@@ -37,7 +38,8 @@ def list_traces(
     total_query = select(func.count()).select_from(query.subquery())
     total: int = db.execute(total_query).scalar_one()
 
-    traces = db.execute(query.offset(offset).limit(limit)).scalars().all()
+    # Plain rows rather than ORM Trace objects: nothing here is written back
+    traces = db.execute(query.offset(offset).limit(limit)).all()
 
     return TracesResponse(
         traces=[_trace_to_summary(t) for t in traces],
@@ -49,94 +51,97 @@ def list_traces(
 
 def get_trace_detail(db: Session, trace_id: str) -> TraceDetailResponse | None:
     """Return trace with all its spans, or None if not found."""
-    trace = db.execute(
-        select(models.Trace).where(models.Trace.trace_id == trace_id)
-    ).scalar_one_or_none()
-
-    if trace is None:
-        return None
-
-    spans = (
+    # Trace and spans in one round-trip (LEFT JOIN), spans in start order
+    trace = (
         db.execute(
-            select(models.Span)
-            .where(models.Span.trace_id == trace_id)
-            .order_by(models.Span.start_time)
+            select(models.Trace)
+            .options(joinedload(models.Trace.spans))
+            .where(models.Trace.trace_id == trace_id)
         )
-        .scalars()
-        .all()
+        .unique()
+        .scalar_one_or_none()
     )
 
+    if trace is None:
+        return None
+
     summary = _trace_to_summary(trace)
     return TraceDetailResponse(
         **summary.model_dump(),
-        spans=[span_to_response(s) for s in spans],
+        spans=[span_to_response(s) for s in trace.spans],
     )
 
 
+# Shared by every node; layout is computed client-side, nothing mutates it
+_ORIGIN: dict[str, float] = {"x": 0, "y": 0}
+
+
 def get_trace_graph(db: Session, trace_id: str) -> GraphData | None:
     """Build React Flow graph data from a trace's spans.
 
     Returns { nodes, edges } with all positions set to {x: 0, y: 0}
     (layout is computed client-side by dagre).
     """
-    trace = db.execute(
-        select(models.Trace).where(models.Trace.trace_id == trace_id)
-    ).scalar_one_or_none()
+    exists = db.execute(
+        select(models.Trace.trace_id).where(models.Trace.trace_id == trace_id)
+    ).first()
 
-    if trace is None:
+    if exists is None:
         return None
 
-    spans = (
-        db.execute(
-            select(models.Span)
-            .where(models.Span.trace_id == trace_id)
-            .order_by(models.Span.start_time)
-        )
-        .scalars()
-        .all()
-    )
-
-    nodes: list[GraphNode] = []
-    edges: list[GraphEdge] = []
-
-    for seq, span in enumerate(spans, start=1):
-        attrs = json.loads(span.attributes or "{}")
-        duration_ms = (
-            (span.end_time - span.start_time) * 1000
-            if span.end_time is not None
-            else None
+    # Only the columns a node needs; attributes are never loaded or decoded
+    spans = db.execute(
+        select(
+            models.Span.span_id,
+            models.Span.parent_span_id,
+            models.Span.span_type,
+            models.Span.name,
+            models.Span.status,
+            models.Span.start_time,
+            models.Span.end_time,
+            models.Span.cost_usd,
+            func.json_extract(models.Span.attributes, '$."agent.framework"').label(
+                "framework"
+            ),
         )
-        cost_usd = attrs.get("llm.cost_usd")
-        framework = attrs.get("agent.framework")
-
-        nodes.append(
-            GraphNode(
-                id=span.span_id,
-                type="spanNode",
-                data=GraphNodeData(
-                    span_id=span.span_id,
-                    span_type=span.span_type,
-                    name=span.name,
-                    status=span.status,
-                    duration_ms=duration_ms,
-                    cost_usd=cost_usd,
-                    sequence=seq,
-                    framework=framework,
+        .where(models.Span.trace_id == trace_id)
+        .order_by(models.Span.start_time)
+    ).all()
+
+    # Rows come from our own table, so the models are built unvalidated
+    nodes = [
+        GraphNode.model_construct(
+            id=span.span_id,
+            type="spanNode",
+            data=GraphNodeData.model_construct(
+                span_id=span.span_id,
+                span_type=SpanType(span.span_type),
+                name=span.name,
+                status=SpanStatus(span.status or SpanStatus.UNSET),
+                duration_ms=(
+                    (span.end_time - span.start_time) * 1000
+                    if span.end_time is not None
+                    else None
                 ),
-                position={"x": 0, "y": 0},
-            )
+                cost_usd=span.cost_usd,
+                sequence=seq,
+                framework=span.framework if isinstance(span.framework, str) else None,
+            ),
+            position=_ORIGIN,
         )
+        for seq, span in enumerate(spans, start=1)
+    ]
+    edges = [
+        GraphEdge.model_construct(
+            id=f"edge-{span.parent_span_id}-{span.span_id}",
+            source=span.parent_span_id,
+            target=span.span_id,
+        )
+        for span in spans
+        if span.parent_span_id
+    ]
 
-        if span.parent_span_id:
-            edges.append(
-                GraphEdge(
-                    id=f"edge-{span.parent_span_id}-{span.span_id}",
-                    source=span.parent_span_id,
-                    target=span.span_id,
-                )
-            )
-
-    return GraphData(nodes=nodes, edges=edges)
+    return GraphData.model_construct(nodes=nodes, edges=edges)
 
 
 def delete_trace(db: Session, trace_id: str) -> bool:
@@ -203,7 +208,7 @@ def update_trace_tags(
     ).scalar_one_or_none()
     if trace is None:
         return None
-    trace.tags = json.dumps(tags)
+    trace.tags = tags
     db.commit()
     db.refresh(trace)
     return _trace_to_summary(trace)
@@ -221,36 +226,46 @@ def find_baseline_trace(
         .all()
     )
     for trace in traces:
-        tags: dict[str, str] = {}
-        if isinstance(trace.tags, str):
-            tags = json.loads(trace.tags)
-        elif isinstance(trace.tags, dict):
-            tags = trace.tags
+        tags: dict[str, str] = trace.tags or {}
         if tags.get("baseline") == "true" and trace.trace_id != exclude_trace_id:
             return _trace_to_summary(trace)
     return None
 
 
-def _trace_to_summary(trace: models.Trace) -> TraceSummary:
+_SUMMARY_COLUMNS = (
+    models.Trace.trace_id,
+    models.Trace.name,
+    models.Trace.start_time,
+    models.Trace.end_time,
+    models.Trace.span_count,
+    models.Trace.status,
+    models.Trace.total_cost_usd,
+    models.Trace.total_tokens,
+    models.Trace.tags,
+    models.Trace.sdk_language,
+)
+
+
+def _trace_to_summary(trace: models.Trace | Row[Any]) -> TraceSummary:
+    """Build a TraceSummary from a Trace or a row of ``_SUMMARY_COLUMNS``.
+
+    Values come straight from our own table, so validation is skipped.
+    """
     duration_ms = (
         (trace.end_time - trace.start_time) * 1000
         if trace.end_time is not None
         else None
     )
-    tags: dict[str, str] = {}
-    if isinstance(trace.tags, str):
-        tags = json.loads(trace.tags)
-    elif isinstance(trace.tags, dict):
-        tags = trace.tags
+    tags: dict[str, str] = trace.tags or {}
 
-    return TraceSummary(
+    return TraceSummary.model_construct(
         trace_id=trace.trace_id,
         name=trace.name,
         start_time=trace.start_time,
         end_time=trace.end_time,
         duration_ms=duration_ms,
         span_count=trace.span_count or 0,
-        status=trace.status or SpanStatus.UNSET,
+        status=SpanStatus(trace.status or SpanStatus.UNSET),
         total_cost_usd=trace.total_cost_usd or 0,
         total_tokens=trace.total_tokens or 0,
         tags=tags,
@@ -0,0 +1,38 @@
+"""orjson-backed JSON helpers.
+
+``dumps`` returns ``str`` (not ``bytes``) so results can be stored in TEXT
+columns and span attributes exactly where stdlib ``json.dumps`` was used.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import orjson
+
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize *obj* to a compact (or two-space indented) JSON string.
+
+    Falls back to stdlib ``json`` for what orjson refuses but is still valid
+    JSON, such as integers wider than 64 bits in user-supplied attributes.
+    """
+    option = (orjson.OPT_INDENT_2 if indent else 0) | (
+        orjson.OPT_SORT_KEYS if sort_keys else 0
+    )
+    try:
+        return orjson.dumps(obj, option=option or None).decode()
+    except orjson.JSONEncodeError:
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+        return json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys
+        )
+
+
+def loads(data: str | bytes) -> Any:
+    """Deserialize a JSON document."""
+    return orjson.loads(data)
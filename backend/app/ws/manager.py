@@ -1,12 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Iterable, Iterator
+from itertools import chain
 from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.utils import json as json_utils
+
 logger = logging.getLogger(__name__)
 
+# A client that cannot take a frame within this long is dropped
+SEND_TIMEOUT_S = 1.0
+
+# Attributes kept in live span frames; the full set is fetched via the REST API
+SLIM_ATTR_KEYS = frozenset(
+    {
+        "llm.model",
+        "llm.cost_usd",
+        "llm.tokens.total",
+        "error.type",
+        "agent.framework",
+    }
+)
+
+
+def _slim_span(span_dict: dict[str, Any]) -> dict[str, Any]:
+    """Return *span_dict* with attributes cut down to ``SLIM_ATTR_KEYS``.
+
+    Sets ``attributes_truncated`` when anything was dropped so clients know
+    to load the full span before showing its details.
+    """
+    attributes: dict[str, Any] = span_dict.get("attributes") or {}
+    kept = {k: v for k, v in attributes.items() if k in SLIM_ATTR_KEYS}
+    if len(kept) == len(attributes):
+        return span_dict
+    return {**span_dict, "attributes": kept, "attributes_truncated": True}
+
 
 class ConnectionManager:
     """Manages WebSocket connections and trace-level subscriptions.
@@ -14,11 +46,19 @@ class ConnectionManager:
     Clients start in ``active_connections`` (receive all events).
     On ``subscribe_trace``, they move to ``trace_subscriptions`` (filtered).
     On ``unsubscribe_trace``, they move back to ``active_connections``.
+
+    Span events carry slimmed attributes unless the client subscribed with
+    ``include_attributes`` (tracked in ``full_attribute_clients``).
     """
 
     def __init__(self) -> None:
         self.active_connections: set[WebSocket] = set()
         self.trace_subscriptions: dict[str, set[WebSocket]] = {}
+        self.full_attribute_clients: set[WebSocket] = set()
+        # Reverse index of trace_subscriptions, so disconnect is O(own traces)
+        self.ws_traces: dict[WebSocket, set[str]] = {}
+        # Strong refs to in-flight close tasks so they aren't garbage collected
+        self._closing: set[asyncio.Task[None]] = set()
 
     async def connect(self, ws: WebSocket) -> None:
         await ws.accept()
@@ -26,14 +66,85 @@ class ConnectionManager:
 
     def disconnect(self, ws: WebSocket) -> None:
         self.active_connections.discard(ws)
-        for sockets in self.trace_subscriptions.values():
-            sockets.discard(ws)
+        self.full_attribute_clients.discard(ws)
+        for trace_id in self.ws_traces.pop(ws, ()):
+            self._drop_subscriber(trace_id, ws)
+
+    def subscribe(
+        self, ws: WebSocket, trace_id: str, *, include_attributes: bool = False
+    ) -> None:
+        """Move *ws* from the global stream to *trace_id*'s subscribers."""
+        if include_attributes:
+            self.full_attribute_clients.add(ws)
+        else:
+            self.full_attribute_clients.discard(ws)
+        self.active_connections.discard(ws)
+        self.trace_subscriptions.setdefault(trace_id, set()).add(ws)
+        self.ws_traces.setdefault(ws, set()).add(trace_id)
+
+    def unsubscribe(self, ws: WebSocket, trace_id: str) -> None:
+        """Drop *ws* from *trace_id* and return it to the global stream."""
+        traces = self.ws_traces.get(ws)
+        if traces is None or trace_id not in traces:
+            return
+        traces.discard(trace_id)
+        if not traces:
+            del self.ws_traces[ws]
+        self._drop_subscriber(trace_id, ws)
+        self.active_connections.add(ws)
+
+    def _drop_subscriber(self, trace_id: str, ws: WebSocket) -> None:
+        sockets = self.trace_subscriptions.get(trace_id)
+        if sockets is None:
+            return
+        sockets.discard(ws)
+        if not sockets:
+            del self.trace_subscriptions[trace_id]
 
     async def broadcast_span(self, span_dict: dict[str, Any]) -> None:
         """Send span_created to unsubscribed clients + clients watching this trace."""
         trace_id = span_dict.get("trace_id", "")
         targets = self._targets_for_trace(trace_id)
-        await self._send_to(targets, {"event": "span_created", "span": span_dict})
+        await self._send_to(
+            targets,
+            {"event": "span_created", "span": _slim_span(span_dict)},
+            {"event": "span_created", "span": span_dict},
+        )
+
+    async def broadcast_spans(self, span_dicts: list[dict[str, Any]]) -> None:
+        """Send several spans of one trace as a single spans_created frame."""
+        if not span_dicts:
+            return
+        trace_id = span_dicts[0].get("trace_id", "")
+        targets = self._targets_for_trace(trace_id)
+        await self._send_to(
+            targets,
+            {"event": "spans_created", "spans": [_slim_span(s) for s in span_dicts]},
+            {"event": "spans_created", "spans": span_dicts},
+        )
+
+    async def broadcast_span_pending(self, span_dict: dict[str, Any]) -> None:
+        """Announce an in-flight span that has not been persisted yet."""
+        trace_id = span_dict.get("trace_id", "")
+        targets = self._targets_for_trace(trace_id)
+        await self._send_to(
+            targets,
+            {"event": "span_pending", "span": _slim_span(span_dict)},
+            {"event": "span_pending", "span": span_dict},
+        )
+
+    async def broadcast_span_delta(
+        self,
+        span_id: str,
+        trace_id: str,
+        delta: str,
+    ) -> None:
+        """Send a streamed completion fragment for an in-flight span."""
+        targets = self._targets_for_trace(trace_id)
+        await self._send_to(
+            targets,
+            {"event": "span_delta", "span_id": span_id, "delta": delta},
+        )
 
     async def broadcast_span_updated(
         self,
@@ -51,26 +162,69 @@ class ConnectionManager:
     async def broadcast_trace_created(self, trace_dict: dict[str, Any]) -> None:
         """Send trace_created to all unfiltered clients."""
         await self._send_to(
-            set(self.active_connections),
+            self.active_connections,
             {"event": "trace_created", "trace": trace_dict},
         )
 
-    def _targets_for_trace(self, trace_id: str) -> set[WebSocket]:
-        """Return unsubscribed clients + clients subscribed to this trace."""
-        return set(self.active_connections) | self.trace_subscriptions.get(
-            trace_id, set()
-        )
+    def _targets_for_trace(self, trace_id: str) -> Iterator[WebSocket]:
+        """Yield unsubscribed clients + clients subscribed to this trace.
 
-    async def _send_to(self, targets: set[WebSocket], payload: dict[str, Any]) -> None:
-        for ws in list(targets):
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                logger.debug(
-                    "WebSocket send failed, disconnecting client",
-                    exc_info=True,
-                )
-                self.disconnect(ws)
+        Subscribing moves a client out of ``active_connections``, so the two
+        only overlap for a client still subscribed to another trace after
+        an unsubscribe; those are skipped instead of copying both sets.
+        """
+        active = self.active_connections
+        subscribed = self.trace_subscriptions.get(trace_id, ())
+        return chain(active, (ws for ws in subscribed if ws not in active))
+
+    async def _send_to(
+        self,
+        targets: Iterable[WebSocket],
+        payload: dict[str, Any],
+        full_payload: dict[str, Any] | None = None,
+    ) -> None:
+        """Send *payload* to all *targets* concurrently.
+
+        Clients in ``full_attribute_clients`` get *full_payload* instead, when
+        given.  Each frame is encoded at most once, on first use, and shared by
+        every client; a slow client only delays itself, and is disconnected
+        after ``SEND_TIMEOUT_S``.
+        """
+        text: str | None = None
+        full_text: str | None = None
+        async with asyncio.TaskGroup() as tg:
+            # Tasks only start at the end of this block, so iterating the live
+            # connection sets is safe even though failed sends disconnect.
+            for ws in targets:
+                if full_payload is not None and ws in self.full_attribute_clients:
+                    if full_text is None:
+                        full_text = json_utils.dumps(full_payload)
+                    frame = full_text
+                else:
+                    if text is None:
+                        text = json_utils.dumps(payload)
+                    frame = text
+                tg.create_task(self._safe_send(ws, frame))
+
+    async def _safe_send(self, ws: WebSocket, text: str) -> None:
+        try:
+            await asyncio.wait_for(ws.send_text(text), timeout=SEND_TIMEOUT_S)
+        except Exception:
+            logger.debug(
+                "WebSocket send failed, disconnecting client",
+                exc_info=True,
+            )
+            self.disconnect(ws)
+            # Close the socket too, so the client sees it drop and reconnects
+            task = asyncio.create_task(self._close_dropped(ws))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _close_dropped(self, ws: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(ws.close(code=1013), timeout=SEND_TIMEOUT_S)
+        except Exception:
+            logger.debug("Closing dropped WebSocket client failed", exc_info=True)
 
 
 ws_manager = ConnectionManager()
@@ -89,17 +243,14 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                 await websocket.send_json({"error": "Invalid JSON"})
                 continue
             action = data.get("action")
-            if action == "subscribe_trace":
-                trace_id = data.get("trace_id")
-                if trace_id:
-                    ws_manager.active_connections.discard(websocket)
-                    ws_manager.trace_subscriptions.setdefault(trace_id, set()).add(
-                        websocket
-                    )
-            elif action == "unsubscribe_trace":
-                trace_id = data.get("trace_id")
-                if trace_id and trace_id in ws_manager.trace_subscriptions:
-                    ws_manager.trace_subscriptions[trace_id].discard(websocket)
-                    ws_manager.active_connections.add(websocket)
+            trace_id = data.get("trace_id")
+            if action == "subscribe_trace" and trace_id:
+                ws_manager.subscribe(
+                    websocket,
+                    trace_id,
+                    include_attributes=bool(data.get("include_attributes")),
+                )
+            elif action == "unsubscribe_trace" and trace_id:
+                ws_manager.unsubscribe(websocket, trace_id)
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
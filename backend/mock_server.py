@@ -6,6 +6,8 @@ Requires no dependencies beyond Python stdlib.
 Usage:
     python backend/mock_server.py
 
+Set MOCK_VERBOSE=1 to log every request.
+
 Then run the frontend:
     cd frontend && npm run dev
 
@@ -16,12 +18,15 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import re
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
 logging.basicConfig(level=logging.INFO, format="[mock] %(message)s")
 logger = logging.getLogger(__name__)
+VERBOSE = bool(os.environ.get("MOCK_VERBOSE"))
 
 # --- Mock Data ---
 
@@ -398,69 +403,79 @@ def build_graph(trace_id: str) -> dict[str, Any]:
     return {"nodes": nodes, "edges": edges}
 
 
-class MockHandler(BaseHTTPRequestHandler):
-    def do_GET(self) -> None:
-        path = self.path.split("?")[0]
+# The mock data never changes, so every response body is encoded once here.
+HEALTH_JSON = json.dumps({"status": "ok", "version": "0.1.0", "db_path": "mock"}).encode()
+TRACES_JSON = json.dumps({
+    "traces": TRACES,
+    "total": len(TRACES),
+    "limit": 50,
+    "offset": 0,
+}).encode()
+TRACE_DETAIL_JSON: dict[str, bytes] = {
+    t["trace_id"]: json.dumps({**t, "spans": SPANS.get(t["trace_id"], [])}).encode()
+    for t in TRACES
+}
+GRAPH_JSON: dict[str, bytes] = {
+    trace_id: json.dumps(build_graph(trace_id)).encode()
+    for trace_id, trace_spans in SPANS.items()
+    if trace_spans
+}
+SPAN_JSON: dict[str, bytes] = {
+    span_id: json.dumps(span).encode() for span_id, span in ALL_SPANS.items()
+}
+_TRACE_404 = json.dumps({"detail": "Trace not found"}).encode()
+_SPAN_404 = json.dumps({"detail": "Span not found"}).encode()
+_ERROR_404 = json.dumps({"detail": "Not found"}).encode()
 
-        if path == "/health":
-            self._json_response({"status": "ok", "version": "0.1.0", "db_path": "mock"})
-            return
 
-        if path == "/v1/traces":
-            self._json_response({
-                "traces": TRACES,
-                "total": len(TRACES),
-                "limit": 50,
-                "offset": 0,
-            })
-            return
+STATIC_ROUTES: dict[str, bytes] = {"/health": HEALTH_JSON, "/v1/traces": TRACES_JSON}
+# (pattern, bodies keyed by the captured id, body when the id is unknown)
+PARAM_ROUTES: list[tuple[re.Pattern[str], dict[str, bytes], bytes]] = [
+    (re.compile(r"/v1/traces/([^/]+)/graph"), GRAPH_JSON, _TRACE_404),
+    (re.compile(r"/v1/traces/([^/]+)"), TRACE_DETAIL_JSON, _TRACE_404),
+    (re.compile(r"/v1/spans/([^/]+)"), SPAN_JSON, _SPAN_404),
+]
 
-        if path.startswith("/v1/traces/") and path.endswith("/graph"):
-            trace_id = path.split("/")[3]
-            graph = build_graph(trace_id)
-            if graph["nodes"]:
-                self._json_response(graph)
-            else:
-                self._error_response(404, "Trace not found")
-            return
 
-        if path.startswith("/v1/traces/"):
-            trace_id = path.split("/")[3]
-            trace = next((t for t in TRACES if t["trace_id"] == trace_id), None)
-            if trace:
-                self._json_response({**trace, "spans": SPANS.get(trace_id, [])})
-            else:
-                self._error_response(404, "Trace not found")
-            return
+class MockHandler(BaseHTTPRequestHandler):
+    # Keep-alive: the Vite proxy reuses connections instead of reconnecting
+    protocol_version = "HTTP/1.1"
+    # Buffer wfile so headers and body leave in one write; handle_one_request
+    # flushes after each response.
+    wbufsize = -1
+
+    def do_GET(self) -> None:
+        path, _, _ = self.path.partition("?")
 
-        if path.startswith("/v1/spans/"):
-            span_id = path.split("/")[3]
-            span = ALL_SPANS.get(span_id)
-            if span:
-                self._json_response(span)
-            else:
-                self._error_response(404, "Span not found")
+        body = STATIC_ROUTES.get(path)
+        if body is not None:
+            self._send_json(200, body)
             return
 
-        self._error_response(404, "Not found")
+        for pattern, bodies, not_found in PARAM_ROUTES:
+            match = pattern.fullmatch(path)
+            if match:
+                body = bodies.get(match.group(1))
+                if body is None:
+                    self._send_json(404, not_found)
+                else:
+                    self._send_json(200, body)
+                return
+
+        self._send_json(404, _ERROR_404)
 
     def do_OPTIONS(self) -> None:
         self.send_response(204)
         self._cors_headers()
+        self.send_header("Content-Length", "0")
+        self.send_header("Connection", "keep-alive")
         self.end_headers()
 
-    def _json_response(self, data: Any) -> None:
-        body = json.dumps(data).encode()
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self._cors_headers()
-        self.end_headers()
-        self.wfile.write(body)
-
-    def _error_response(self, code: int, detail: str) -> None:
-        body = json.dumps({"detail": detail}).encode()
+    def _send_json(self, code: int, body: bytes) -> None:
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "keep-alive")
         self._cors_headers()
         self.end_headers()
         self.wfile.write(body)
@@ -470,13 +485,18 @@ class MockHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
 
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        # Access lines cost a locked stderr write per request; errors still log
+        if VERBOSE:
+            super().log_request(code, size)
+
     def log_message(self, fmt: str, *args: Any) -> None:
         logger.info(fmt, *args)
 
 
 def main() -> None:
     port = 7474
-    server = HTTPServer(("localhost", port), MockHandler)
+    server = ThreadingHTTPServer(("localhost", port), MockHandler)
     logger.info("Mock server running at http://localhost:%d", port)
     logger.info("Press Ctrl+C to stop")
     try:
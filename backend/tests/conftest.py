@@ -1,44 +1,98 @@
 from __future__ import annotations
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
 
-from app.database import Base, get_db
-from app.main import app
+# The app lifespan runs init_db() against settings.db_path, which is read at
+# import. Point it at a throwaway file first so tests never touch the real
+# ~/.beacon database; mkdtemp gives each pytest-xdist worker its own copy.
+# Provider warm-up is off so startup never calls out to real LLM hosts.
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="beacon-tests-")
+atexit.register(shutil.rmtree, _TEST_DB_DIR, ignore_errors=True)
+os.environ["BEACON_DB_PATH"] = os.path.join(_TEST_DB_DIR, "traces.db")
+os.environ["BEACON_WARMUP_PROVIDERS"] = "false"
 
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
 
-@pytest.fixture(name="db_session")
-def fixture_db_session():
-    """In-memory SQLite database for each test."""
+from app.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import settings_service  # noqa: E402
+from app.utils import json as json_utils  # noqa: E402
+
+# Keep saved API keys in ~/.beacon/config.json out of the tests as well
+settings_service._CONFIG_PATH = Path(_TEST_DB_DIR) / "config.json"
+
+
+@pytest.fixture(name="db_engine", scope="session")
+def fixture_db_engine():
+    """In-memory SQLite database, created once for the whole session."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
+        json_serializer=json_utils.dumps,
+        json_deserializer=json_utils.loads,
     )
 
     @event.listens_for(engine, "connect")
     def _set_sqlite_pragma(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself so tests can run inside an outer
+        # transaction with SAVEPOINTs (pysqlite defers BEGIN otherwise).
+        dbapi_connection.isolation_level = None
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        # Durability is moot for :memory:; skip the sync and temp-file work
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
         cursor.close()
 
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
-    testing_session_local = sessionmaker(
-        autocommit=False, autoflush=False, bind=engine
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(name="db_session")
+def fixture_db_session(db_engine):
+    """Session for one test, rolled back afterwards.
+
+    Service-level commits and rollbacks only release or roll back a
+    SAVEPOINT inside the outer transaction.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
     )
-    session = testing_session_local()
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(name="app_client", scope="session")
+def fixture_app_client():
+    """One TestClient for the session, so app lifespan runs only once."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(name="client")
-def fixture_client(db_session):
+def fixture_client(app_client, db_session):
     """FastAPI test client with overridden database dependency."""
 
     def override_get_db():
@@ -48,6 +102,7 @@ def fixture_client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
-    app.dependency_overrides.clear()
+    try:
+        yield app_client
+    finally:
+        app.dependency_overrides.clear()
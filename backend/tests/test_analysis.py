@@ -40,11 +40,9 @@ def _make_span(**overrides: Any) -> dict[str, Any]:
     return defaults
 
 
-def _ingest_span(client: TestClient, **overrides: Any) -> dict[str, Any]:
-    span = _make_span(**overrides)
-    resp = client.post("/v1/spans", json={"spans": [span]})
+def _ingest_spans(client: TestClient, spans: list[dict[str, Any]]) -> None:
+    resp = client.post("/v1/spans", json={"spans": spans})
     assert resp.status_code == 200
-    return span
 
 
 # ---------------------------------------------------------------------------
@@ -118,11 +116,11 @@ class TestBuildTraceContext:
             start_time = 1700000000.0
             end_time = 1700000001.5
             error_message = None
-            attributes = json.dumps({
+            attributes = {
                 "llm.model": "gpt-4o",
                 "llm.tokens.input": 100,
                 "llm.tokens.output": 50,
-            })
+            }
 
         result = build_trace_context([MockSpan()])
         assert "span-001" in result
@@ -205,6 +203,52 @@ MOCK_SUMMARY_RESPONSE = json.dumps({
     ],
 })
 
+MOCK_COST_RESPONSE = json.dumps({
+    "trace_ids": ["placeholder"],
+    "suggestions": [
+        {
+            "type": "model_downgrade",
+            "description": "Use gpt-4o-mini for simple tasks",
+            "estimated_savings_usd": 0.02,
+            "affected_spans": ["s1"],
+        }
+    ],
+})
+
+MOCK_PROMPT_RESPONSE = json.dumps({
+    "span_id": "placeholder",
+    "original_prompt": "Hello",
+    "suggestions": [
+        {
+            "category": "clarity",
+            "description": "Be more specific",
+            "improved_prompt_snippet": "You are a helpful assistant. Hello.",
+        }
+    ],
+})
+
+MOCK_ANOMALY_RESPONSE = json.dumps({
+    "trace_id": "placeholder",
+    "anomalies": [],
+})
+
+MOCK_PATTERNS_RESPONSE = json.dumps({
+    "patterns": [],
+})
+
+MOCK_COMPARE_RESPONSE = json.dumps({
+    "trace_id_a": "a",
+    "trace_id_b": "b",
+    "divergence_points": [],
+    "metric_diff": {
+        "cost_diff_usd": 0.01,
+        "duration_diff_ms": 500.0,
+        "token_diff": 200,
+        "span_count_diff": 1,
+    },
+    "summary": "Traces are structurally similar.",
+})
+
 
 class TestAnalysisRouter:
     def _setup_trace(self, client: TestClient) -> tuple[str, str]:
@@ -213,24 +257,24 @@ class TestAnalysisRouter:
         span_id_1 = str(uuid.uuid4())
         span_id_2 = str(uuid.uuid4())
 
-        _ingest_span(
-            client,
-            trace_id=trace_id,
-            span_id=span_id_1,
-            name="agent-step",
-            span_type="agent_step",
-        )
-        _ingest_span(
-            client,
-            trace_id=trace_id,
-            span_id=span_id_2,
-            parent_span_id=span_id_1,
-            name="openai.chat",
-            span_type="llm_call",
-            status="error",
-            error_message="Rate limit exceeded",
-            attributes={"llm.model": "gpt-4o", "llm.prompt": "Hello"},
-        )
+        _ingest_spans(client, [
+            _make_span(
+                trace_id=trace_id,
+                span_id=span_id_1,
+                name="agent-step",
+                span_type="agent_step",
+            ),
+            _make_span(
+                trace_id=trace_id,
+                span_id=span_id_2,
+                parent_span_id=span_id_1,
+                name="openai.chat",
+                span_type="llm_call",
+                status="error",
+                error_message="Rate limit exceeded",
+                attributes={"llm.model": "gpt-4o", "llm.prompt": "Hello"},
+            ),
+        ])
         return trace_id, span_id_2
 
     @patch(
@@ -282,17 +326,7 @@ class TestAnalysisRouter:
     @patch(
         "app.services.analysis_service.call_analysis_llm",
         new_callable=AsyncMock,
-        return_value=json.dumps({
-            "trace_ids": ["placeholder"],
-            "suggestions": [
-                {
-                    "type": "model_downgrade",
-                    "description": "Use gpt-4o-mini for simple tasks",
-                    "estimated_savings_usd": 0.02,
-                    "affected_spans": ["s1"],
-                }
-            ],
-        }),
+        return_value=MOCK_COST_RESPONSE,
     )
     def test_cost_optimization(self, mock_llm, client):
         trace_id, _ = self._setup_trace(client)
@@ -309,17 +343,7 @@ class TestAnalysisRouter:
     @patch(
         "app.services.analysis_service.call_analysis_llm",
         new_callable=AsyncMock,
-        return_value=json.dumps({
-            "span_id": "placeholder",
-            "original_prompt": "Hello",
-            "suggestions": [
-                {
-                    "category": "clarity",
-                    "description": "Be more specific",
-                    "improved_prompt_snippet": "You are a helpful assistant. Hello.",
-                }
-            ],
-        }),
+        return_value=MOCK_PROMPT_RESPONSE,
     )
     def test_prompt_suggestions(self, mock_llm, client):
         trace_id, span_id = self._setup_trace(client)
@@ -336,10 +360,7 @@ class TestAnalysisRouter:
     @patch(
         "app.services.analysis_service.call_analysis_llm",
         new_callable=AsyncMock,
-        return_value=json.dumps({
-            "trace_id": "placeholder",
-            "anomalies": [],
-        }),
+        return_value=MOCK_ANOMALY_RESPONSE,
     )
     def test_anomaly_detection_no_anomalies(self, mock_llm, client):
         trace_id, _ = self._setup_trace(client)
@@ -355,9 +376,7 @@ class TestAnalysisRouter:
     @patch(
         "app.services.analysis_service.call_analysis_llm",
         new_callable=AsyncMock,
-        return_value=json.dumps({
-            "patterns": [],
-        }),
+        return_value=MOCK_PATTERNS_RESPONSE,
     )
     def test_error_patterns_empty(self, mock_llm, client):
         trace_id, _ = self._setup_trace(client)
@@ -372,18 +391,7 @@ class TestAnalysisRouter:
     @patch(
         "app.services.analysis_service.call_analysis_llm",
         new_callable=AsyncMock,
-        return_value=json.dumps({
-            "trace_id_a": "a",
-            "trace_id_b": "b",
-            "divergence_points": [],
-            "metric_diff": {
-                "cost_diff_usd": 0.01,
-                "duration_diff_ms": 500.0,
-                "token_diff": 200,
-                "span_count_diff": 1,
-            },
-            "summary": "Traces are structurally similar.",
-        }),
+        return_value=MOCK_COMPARE_RESPONSE,
     )
     def test_compare_traces(self, mock_llm, client):
         trace_id_a, _ = self._setup_trace(client)
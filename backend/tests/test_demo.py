@@ -9,9 +9,12 @@ import pytest
 from app.services import settings_service
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="module")
 def _mock_ws_manager() -> None:
-    """Prevent WebSocket broadcast from failing in tests."""
+    """Prevent WebSocket broadcast from failing in tests.
+
+    No test asserts on the broadcasts, so one patch serves the whole module.
+    """
     with patch("app.services.demo_service.ws_manager") as mock_ws:
         mock_ws.broadcast_span = AsyncMock()
         mock_ws.broadcast_trace_created = AsyncMock()
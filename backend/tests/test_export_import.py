@@ -6,8 +6,11 @@ import csv
 import io
 import json
 import uuid
+from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
+import pytest
 from starlette.testclient import TestClient
 
 
@@ -29,17 +32,21 @@ def _make_span(**overrides: Any) -> dict[str, Any]:
     return defaults
 
 
+def _ingest_spans(client: TestClient, spans: list[dict[str, Any]]) -> None:
+    """Helper: ingest *spans* in a single request."""
+    client.post("/v1/spans", json={"spans": spans})
+
+
 def _ingest_span(client: TestClient, **overrides: Any) -> dict[str, Any]:
     """Helper: ingest a single span and return its dict."""
     span = _make_span(**overrides)
-    client.post("/v1/spans", json={"spans": [span]})
+    _ingest_spans(client, [span])
     return span
 
 
 def _ingest_trace(client: TestClient, trace_id: str) -> list[dict[str, Any]]:
     """Ingest a multi-span trace and return spans."""
-    root = _ingest_span(
-        client,
+    root = _make_span(
         trace_id=trace_id,
         span_id="root-span",
         name="root-agent",
@@ -47,8 +54,7 @@ def _ingest_trace(client: TestClient, trace_id: str) -> list[dict[str, Any]]:
         start_time=1700000000.0,
         end_time=1700000005.0,
     )
-    child = _ingest_span(
-        client,
+    child = _make_span(
         trace_id=trace_id,
         span_id="child-span",
         parent_span_id="root-span",
@@ -63,6 +69,7 @@ def _ingest_trace(client: TestClient, trace_id: str) -> list[dict[str, Any]]:
             "llm.tokens.total": 500,
         },
     )
+    _ingest_spans(client, [root, child])
     return [root, child]
 
 
@@ -132,6 +139,19 @@ def test_export_otel_not_found(client: TestClient) -> None:
     assert resp.status_code == 404
 
 
+def test_export_json_matches_trace_detail(client: TestClient) -> None:
+    trace_id = str(uuid.uuid4())
+    _ingest_trace(client, trace_id)
+
+    exported = client.get(f"/v1/traces/{trace_id}/export?format=json").json()
+    detail = client.get(f"/v1/traces/{trace_id}").json()
+
+    assert exported["version"] == "1"
+    assert exported["format"] == "beacon"
+    assert exported["spans"] == detail.pop("spans")
+    assert exported["trace"] == detail
+
+
 # --- GET /v1/traces/{trace_id}/export?format=csv ---
 
 
@@ -157,6 +177,18 @@ def test_export_csv_returns_valid_csv(client: TestClient) -> None:
     assert "tokens" in header
 
 
+def test_export_csv_rows_survive_chunking(client: TestClient) -> None:
+    trace_id = str(uuid.uuid4())
+    _ingest_trace(client, trace_id)
+
+    with patch("app.services.export_service._CSV_CHUNK_ROWS", 1):
+        resp = client.get(f"/v1/traces/{trace_id}/export?format=csv")
+
+    rows = list(csv.reader(io.StringIO(resp.text)))
+    assert [row[1] for row in rows] == ["span_id", "root-span", "child-span"]
+    assert rows[2][9:] == ["0.005", "500"]
+
+
 def test_export_csv_not_found(client: TestClient) -> None:
     resp = client.get("/v1/traces/nonexistent/export?format=csv")
     assert resp.status_code == 404
@@ -317,15 +349,13 @@ def test_export_import_roundtrip(client: TestClient) -> None:
     # Change all IDs for re-import
     new_trace_id = str(uuid.uuid4())
     exported["trace"]["trace_id"] = new_trace_id
+    id_map = {span["span_id"]: f"rt-{span['span_id']}" for span in exported["spans"]}
     for span in exported["spans"]:
-        old_id = span["span_id"]
-        new_id = f"rt-{old_id}"
-        span["span_id"] = new_id
+        span["span_id"] = id_map[span["span_id"]]
         span["trace_id"] = new_trace_id
-        # Update parent references
-        for other in exported["spans"]:
-            if other.get("parent_span_id") == old_id:
-                other["parent_span_id"] = new_id
+        parent_id = span.get("parent_span_id")
+        if parent_id:
+            span["parent_span_id"] = id_map.get(parent_id, parent_id)
 
     # Import
     import_resp = client.post("/v1/traces/import", json=exported)
@@ -346,19 +376,31 @@ def test_export_import_roundtrip(client: TestClient) -> None:
 # --- Import from example files ---
 
 
-def test_import_example_rag_agent(client: TestClient) -> None:
-    with open("docs/example-traces/rag-agent.json") as f:
-        data = json.load(f)
+EXAMPLE_TRACES_DIR = Path(__file__).resolve().parents[2] / "docs" / "example-traces"
 
-    resp = client.post("/v1/traces/import", json=data)
+
+@pytest.fixture(scope="session")
+def rag_agent_example() -> dict[str, Any]:
+    return json.loads((EXAMPLE_TRACES_DIR / "rag-agent.json").read_text())
+
+
+@pytest.fixture(scope="session")
+def tool_agent_example() -> dict[str, Any]:
+    path = EXAMPLE_TRACES_DIR / "tool-calling-agent-with-errors.json"
+    return json.loads(path.read_text())
+
+
+def test_import_example_rag_agent(
+    client: TestClient, rag_agent_example: dict[str, Any]
+) -> None:
+    resp = client.post("/v1/traces/import", json=rag_agent_example)
     assert resp.status_code == 200
     assert resp.json()["span_count"] == 5
 
 
-def test_import_example_tool_agent(client: TestClient) -> None:
-    with open("docs/example-traces/tool-calling-agent-with-errors.json") as f:
-        data = json.load(f)
-
-    resp = client.post("/v1/traces/import", json=data)
+def test_import_example_tool_agent(
+    client: TestClient, tool_agent_example: dict[str, Any]
+) -> None:
+    resp = client.post("/v1/traces/import", json=tool_agent_example)
     assert resp.status_code == 200
     assert resp.json()["span_count"] == 6
@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
 import pytest
+from fastapi.testclient import TestClient
 
+from app.config import settings as app_settings
+from app.main import app
+from app.services import http_client, settings_service
+from app.services.http_client import close_client, get_client
 from app.services.llm_client import (
-    PRICE_TABLE,
+    CONTEXT_WINDOW,
     MODEL_PROVIDER,
+    PRICE_TABLE,
+    call_anthropic,
+    call_openai,
     estimate_cost,
     provider_for_model,
+    stream_anthropic,
+    stream_openai,
+    warmup,
 )
 
 
@@ -34,6 +49,14 @@ class TestEstimateCost:
         cost = estimate_cost("claude-sonnet-4-6", 1_000_000, 1_000_000)
         assert cost == pytest.approx(18.0)
 
+    def test_cached_tokens_discounted(self) -> None:
+        # Anthropic cache reads cost 10% of the $3.00/1M input price
+        cost = estimate_cost("claude-sonnet-4-6", 1_000_000, 0, cached_tokens=1_000_000)
+        assert cost == pytest.approx(0.30)
+        # OpenAI cache reads cost 25% of the $2.00/1M input price
+        cost = estimate_cost("gpt-4.1", 1_000_000, 0, cached_tokens=500_000)
+        assert cost == pytest.approx(1.0 + 0.25)
+
 
 class TestProviderForModel:
     def test_openai_known(self) -> None:
@@ -62,3 +85,200 @@ class TestRegistryConsistency:
     def test_price_table_and_provider_have_same_keys(self) -> None:
         """PRICE_TABLE and MODEL_PROVIDER must stay in sync."""
         assert set(PRICE_TABLE.keys()) == set(MODEL_PROVIDER.keys())
+        assert set(PRICE_TABLE.keys()) == set(CONTEXT_WINDOW.keys())
+
+    def test_registries_are_read_only(self) -> None:
+        with pytest.raises(TypeError):
+            PRICE_TABLE["new-model"] = (1.0, 1.0)  # type: ignore[index]
+        with pytest.raises(TypeError):
+            MODEL_PROVIDER["new-model"] = "openai"  # type: ignore[index]
+
+
+class TestSharedClient:
+    async def test_client_is_reused_until_closed(self) -> None:
+        first = get_client()
+        assert get_client() is first
+        await close_client()
+        assert first.is_closed
+        assert get_client() is not first
+        await close_client()
+
+    @patch("httpx.AsyncClient.head", new_callable=AsyncMock)
+    async def test_warmup_ignores_connection_errors(self, mock_head: AsyncMock) -> None:
+        mock_head.side_effect = httpx.ConnectError("offline")
+        await warmup("openai")
+        mock_head.assert_awaited_once()
+        await close_client()
+
+    async def test_warmup_unknown_provider_raises(self) -> None:
+        with pytest.raises(ValueError, match="Unsupported provider"):
+            await warmup("unknown")
+
+    def test_startup_warmup_follows_setting(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings_service, "_CONFIG_PATH", tmp_path / "config.json")
+        settings_service.set_api_key("openai", "sk-test")
+        with patch("app.main.llm_client.warmup", new_callable=AsyncMock) as mock_warmup:
+            with TestClient(app):
+                mock_warmup.assert_not_called()
+            monkeypatch.setattr(app_settings, "warmup_providers", True)
+            with TestClient(app):
+                mock_warmup.assert_called_once_with("openai")
+
+
+class TestPromptCaching:
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_anthropic_marks_long_prefix_for_caching(
+        self, mock_post: AsyncMock
+    ) -> None:
+        mock_post.return_value = httpx.Response(
+            status_code=200,
+            json={
+                "content": [{"type": "text", "text": "ok"}],
+                "usage": {
+                    "input_tokens": 10,
+                    "cache_read_input_tokens": 2000,
+                    "cache_creation_input_tokens": 0,
+                    "output_tokens": 5,
+                },
+            },
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+        )
+        long_text = "x" * 5000
+        messages = [
+            {"role": "system", "content": long_text},
+            {"role": "user", "content": long_text},
+            {"role": "assistant", "content": "short"},
+            {"role": "user", "content": long_text},
+        ]
+
+        _, input_tokens, output_tokens, cached_tokens = await call_anthropic(
+            "key", "claude-sonnet-4-6", messages
+        )
+
+        payload = mock_post.await_args.kwargs["json"]
+        assert payload["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert payload["messages"][0]["content"][0]["cache_control"] == {
+            "type": "ephemeral"
+        }
+        # Only the earliest long user message gets a breakpoint
+        assert payload["messages"][2]["content"] == long_text
+        assert (input_tokens, output_tokens, cached_tokens) == (2010, 5, 2000)
+        await close_client()
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_anthropic_short_system_prompt_stays_plain(
+        self, mock_post: AsyncMock
+    ) -> None:
+        mock_post.return_value = httpx.Response(
+            status_code=200,
+            json={
+                "content": [{"type": "text", "text": "ok"}],
+                "usage": {"input_tokens": 10, "output_tokens": 5},
+            },
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+        )
+        messages = [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hi"},
+        ]
+
+        result = await call_anthropic("key", "claude-sonnet-4-6", messages)
+
+        payload = mock_post.await_args.kwargs["json"]
+        assert payload["system"] == "Be brief."
+        assert payload["messages"][0] == {"role": "user", "content": "Hi"}
+        assert result == ("ok", 10, 5, 0)
+        await close_client()
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_openai_reports_cached_tokens(self, mock_post: AsyncMock) -> None:
+        mock_post.return_value = httpx.Response(
+            status_code=200,
+            json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {
+                    "prompt_tokens": 1500,
+                    "completion_tokens": 5,
+                    "prompt_tokens_details": {"cached_tokens": 1024},
+                },
+            },
+            request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+        )
+
+        result = await call_openai(
+            "key", "gpt-4.1", [{"role": "user", "content": "Hi"}]
+        )
+
+        assert result == ("ok", 1500, 5, 1024)
+        await close_client()
+
+
+def _sse(*events: str) -> bytes:
+    return "".join(f"data: {event}\n\n" for event in events).encode()
+
+
+@pytest.fixture
+def sse_client(monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    """Install a shared client whose transport replies with a canned SSE body."""
+
+    def _install(body: bytes, status_code: int = 200) -> None:
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(status_code, content=body)
+        )
+        monkeypatch.setattr(
+            http_client, "_client", httpx.AsyncClient(transport=transport)
+        )
+
+    return _install
+
+
+class TestStreaming:
+    async def test_stream_openai_yields_deltas_then_usage(self, sse_client) -> None:  # type: ignore[no-untyped-def]
+        sse_client(
+            _sse(
+                '{"choices": [{"delta": {"role": "assistant"}}]}',
+                '{"choices": [{"delta": {"content": "Hel"}}]}',
+                '{"choices": [{"delta": {"content": "lo"}}]}',
+                '{"choices": [], "usage": {"prompt_tokens": 1500, '
+                '"completion_tokens": 2, "prompt_tokens_details": {"cached_tokens": 1024}}}',
+                "[DONE]",
+            )
+        )
+        chunks = [
+            chunk
+            async for chunk in stream_openai(
+                "key", "gpt-4.1", [{"role": "user", "content": "Hi"}]
+            )
+        ]
+        assert chunks == [("Hel", None), ("lo", None), ("", (1500, 2, 1024))]
+        await close_client()
+
+    async def test_stream_anthropic_yields_deltas_then_usage(self, sse_client) -> None:  # type: ignore[no-untyped-def]
+        sse_client(
+            _sse(
+                '{"type": "message_start", "message": {"usage": {"input_tokens": 10, '
+                '"cache_read_input_tokens": 2000, "output_tokens": 1}}}',
+                '{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}',
+                '{"type": "message_delta", "usage": {"output_tokens": 7}}',
+                '{"type": "message_stop"}',
+            )
+        )
+        chunks = [
+            chunk
+            async for chunk in stream_anthropic(
+                "key", "claude-sonnet-4-6", [{"role": "user", "content": "Hi"}]
+            )
+        ]
+        assert chunks == [("Hi", None), ("", (2010, 7, 2000))]
+        await close_client()
+
+    async def test_stream_error_status_raises(self, sse_client) -> None:  # type: ignore[no-untyped-def]
+        sse_client(b'{"error": "bad key"}', status_code=401)
+        with pytest.raises(ValueError, match="OpenAI API error 401"):
+            async for _ in stream_openai(
+                "key", "gpt-4.1", [{"role": "user", "content": "Hi"}]
+            ):
+                pass
+        await close_client()
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import uuid
 
+from app.services.otlp_service import convert_otlp_to_spans
+
 
 def _make_otlp_payload(
     spans: list[dict] | None = None,
@@ -212,6 +214,20 @@ def test_otlp_error_status(client):
     assert data["error_message"] == "something broke"
 
 
+def test_otlp_non_string_ids_and_error_message_are_coerced():
+    span = _make_otel_span(
+        status_code=2,
+        attributes=[{"key": "error.message", "value": {"intValue": "500"}}],
+    )
+    span["spanId"] = 42
+    span["parentSpanId"] = 41
+
+    [converted] = convert_otlp_to_spans(_make_otlp_payload(spans=[span]))
+    assert converted.span_id == "42"
+    assert converted.parent_span_id == "41"
+    assert converted.error_message == "500"
+
+
 def test_otlp_parent_span_linking(client, db_session):
     trace_id = str(uuid.uuid4())
     parent_id = str(uuid.uuid4())
@@ -300,6 +316,16 @@ def test_otlp_malformed_payload_missing_keys(client):
     assert data["rejected"] == 0
 
 
+def test_otlp_invalid_json_body_returns_422(client):
+    for body in (b"{not json", b"[1, 2]"):
+        response = client.post(
+            "/v1/otlp/traces",
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+
 def test_otlp_roundtrip_with_export(client):
     """Export a trace as OTEL, then re-import via OTLP. Verify data survives."""
     # First ingest a span normally
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -14,8 +15,11 @@ def _mock_ws_manager() -> None:
     """Prevent WebSocket broadcast from failing in tests."""
     with patch("app.services.playground_service.ws_manager") as mock_ws:
         mock_ws.broadcast_span = AsyncMock()
+        mock_ws.broadcast_spans = AsyncMock()
+        mock_ws.broadcast_span_pending = AsyncMock()
+        mock_ws.broadcast_span_delta = AsyncMock()
         mock_ws.broadcast_trace_created = AsyncMock()
-        yield
+        yield mock_ws
 
 
 @pytest.fixture(autouse=True)
@@ -25,6 +29,17 @@ def _tmp_config(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
     monkeypatch.setattr(settings_service, "_CONFIG_PATH", config_path)
 
 
+def _fake_stream(deltas: list[str], in_tok: int, out_tok: int, cached_tok: int = 0):  # type: ignore[no-untyped-def]
+    """Build a stand-in for llm_client.stream_* yielding *deltas* then usage."""
+
+    async def _stream(*args, **kwargs):  # type: ignore[no-untyped-def]
+        for delta in deltas:
+            yield delta, None
+        yield "", (in_tok, out_tok, cached_tok)
+
+    return _stream
+
+
 class TestPlaygroundRouter:
     def test_chat_no_api_key(self, client) -> None:  # type: ignore[no-untyped-def]
         response = client.post(
@@ -47,13 +62,13 @@ class TestPlaygroundRouter:
         )
         assert response.status_code == 422  # Pydantic validation error
 
-    @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
-    def test_chat_success(self, mock_call, client) -> None:  # type: ignore[no-untyped-def]
+    @patch("app.services.playground_service.stream_openai")
+    def test_chat_success(self, mock_stream, client, _mock_ws_manager) -> None:  # type: ignore[no-untyped-def]
         # Configure API key
         settings_service.set_api_key("openai", "sk-test-key")
 
-        # Mock LLM response
-        mock_call.return_value = ("Hello there!", 10, 5)
+        # Mock streamed LLM response
+        mock_stream.side_effect = _fake_stream(["Hello", " there!"], 10, 5)
 
         response = client.post(
             "/v1/playground/chat",
@@ -71,10 +86,13 @@ class TestPlaygroundRouter:
         assert data["trace_id"] is not None
         assert data["conversation_id"] is not None
 
-    @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
-    def test_chat_creates_spans(self, mock_call, client, db_session) -> None:  # type: ignore[no-untyped-def]
+        deltas = _mock_ws_manager.broadcast_span_delta.await_args_list
+        assert [call.args[2] for call in deltas] == ["Hello", " there!"]
+
+    @patch("app.services.playground_service.stream_openai")
+    def test_chat_creates_spans(self, mock_stream, client, db_session) -> None:  # type: ignore[no-untyped-def]
         settings_service.set_api_key("openai", "sk-test-key")
-        mock_call.return_value = ("Response", 10, 5)
+        mock_stream.side_effect = _fake_stream(["Response"], 10, 5)
 
         response = client.post(
             "/v1/playground/chat",
@@ -96,10 +114,44 @@ class TestPlaygroundRouter:
         assert "agent_step" in span_types
         assert "llm_call" in span_types
 
-    @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
-    def test_chat_error_sets_error_status(self, mock_call, client, db_session) -> None:  # type: ignore[no-untyped-def]
+        # In-flight spans are announced over WS but only persisted once done
+        trace = db_session.get(models.Trace, trace_id)
+        assert trace.span_count == 2
+        assert {s.status for s in spans} == {"ok"}
+
+        llm_span = next(s for s in spans if s.span_type == "llm_call")
+        assert llm_span.attributes["llm.prompt"] == [
+            {"role": "user", "content": "Test"}
+        ]
+
+    @patch("app.services.playground_service.stream_openai")
+    def test_chat_trace_exists_when_announced(self, mock_stream, client, db_session, _mock_ws_manager) -> None:  # type: ignore[no-untyped-def]
+        from app import models
+
         settings_service.set_api_key("openai", "sk-test-key")
-        mock_call.side_effect = ValueError("API Error")
+        mock_stream.side_effect = _fake_stream(["Response"], 10, 5)
+        announced: list[models.Trace | None] = []
+
+        async def _on_trace_created(trace: dict) -> None:  # type: ignore[type-arg]
+            announced.append(db_session.get(models.Trace, trace["trace_id"]))
+
+        _mock_ws_manager.broadcast_trace_created.side_effect = _on_trace_created
+
+        response = client.post(
+            "/v1/playground/chat",
+            json={
+                "model": "gpt-4.1",
+                "messages": [{"role": "user", "content": "Test"}],
+            },
+        )
+        assert response.status_code == 200
+        assert len(announced) == 1
+        assert announced[0] is not None
+
+    @patch("app.services.playground_service.stream_openai")
+    def test_chat_error_sets_error_status(self, mock_stream, client, db_session) -> None:  # type: ignore[no-untyped-def]
+        settings_service.set_api_key("openai", "sk-test-key")
+        mock_stream.side_effect = ValueError("API Error")
 
         response = client.post(
             "/v1/playground/chat",
@@ -134,8 +186,8 @@ class TestPlaygroundRouter:
         settings_service.set_api_key("openai", "sk-test")
         settings_service.set_api_key("anthropic", "sk-ant-test")
 
-        mock_openai.return_value = ("OpenAI response", 10, 20)
-        mock_anthropic.return_value = ("Anthropic response", 15, 25)
+        mock_openai.return_value = ("OpenAI response", 10, 20, 0)
+        mock_anthropic.return_value = ("Anthropic response", 15, 25, 0)
 
         response = client.post(
             "/v1/playground/compare",
@@ -151,6 +203,81 @@ class TestPlaygroundRouter:
         assert data["results"][1]["model"] == "claude-sonnet-4-6"
         assert data["trace_id"] is not None
 
+    @patch("app.services.playground_service.call_anthropic", new_callable=AsyncMock)
+    @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
+    def test_compare_batches_model_spans(self, mock_openai, mock_anthropic, client, db_session, _mock_ws_manager) -> None:  # type: ignore[no-untyped-def]
+        settings_service.set_api_key("openai", "sk-test")
+        settings_service.set_api_key("anthropic", "sk-ant-test")
+
+        mock_openai.return_value = ("OpenAI response", 10, 20, 0)
+        mock_anthropic.side_effect = ValueError("Anthropic API error 500")
+
+        response = client.post(
+            "/v1/playground/compare",
+            json={
+                "models": ["gpt-4.1", "claude-sonnet-4-6"],
+                "messages": [{"role": "user", "content": "Hello"}],
+            },
+        )
+        assert response.status_code == 200
+
+        # Start spans are only announced; the terminal spans are written once
+        pending = _mock_ws_manager.broadcast_span_pending.await_args_list
+        assert [call.args[0]["status"] for call in pending] == ["unset"] * 3
+        batches = _mock_ws_manager.broadcast_spans.await_args_list
+        assert len(batches) == 1
+        assert [s["status"] for s in batches[0].args[0]] == ["error", "ok", "error"]
+
+        from app.models import Span
+
+        spans = db_session.query(Span).filter(Span.span_type == "llm_call").all()
+        assert sorted(s.status for s in spans) == ["error", "ok"]
+
+    @patch("app.services.playground_service.call_anthropic", new_callable=AsyncMock)
+    @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
+    def test_compare_slow_model_times_out(self, mock_openai, mock_anthropic, client) -> None:  # type: ignore[no-untyped-def]
+        settings_service.set_api_key("openai", "sk-test")
+        settings_service.set_api_key("anthropic", "sk-ant-test")
+
+        async def _hang(*args, **kwargs):  # type: ignore[no-untyped-def]
+            await asyncio.sleep(10)
+
+        mock_openai.return_value = ("OpenAI response", 10, 20, 0)
+        mock_anthropic.side_effect = _hang
+
+        response = client.post(
+            "/v1/playground/compare",
+            json={
+                "models": ["gpt-4.1", "claude-sonnet-4-6"],
+                "messages": [{"role": "user", "content": "Hello"}],
+                "timeout": 0.05,
+            },
+        )
+        assert response.status_code == 200
+        fast, slow = response.json()["results"]
+        assert fast["completion"] == "OpenAI response"
+        assert "timed out" in slow["completion"]
+        assert slow["metrics"]["latency_ms"] >= 50
+
+    @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
+    def test_compare_skips_models_with_too_small_context(self, mock_openai, client) -> None:  # type: ignore[no-untyped-def]
+        settings_service.set_api_key("openai", "sk-test")
+        mock_openai.return_value = ("OpenAI response", 10, 20, 0)
+
+        # ~10k tokens: fits gpt-4.1 (1M) but not gpt-4 (8k)
+        response = client.post(
+            "/v1/playground/compare",
+            json={
+                "models": ["gpt-4.1", "gpt-4"],
+                "messages": [{"role": "user", "content": "word " * 10_000}],
+            },
+        )
+        assert response.status_code == 200
+        fits, too_big = response.json()["results"]
+        assert fits["completion"] == "OpenAI response"
+        assert "context window" in too_big["completion"]
+        mock_openai.assert_awaited_once()
+
     # --- Compare prompts (A/B test) ---
 
     def test_compare_prompts_requires_two_prompts(self, client) -> None:  # type: ignore[no-untyped-def]
@@ -176,7 +303,7 @@ class TestPlaygroundRouter:
     @patch("app.services.playground_service.call_openai", new_callable=AsyncMock)
     def test_compare_prompts_success(self, mock_call, client) -> None:  # type: ignore[no-untyped-def]
         settings_service.set_api_key("openai", "sk-test")
-        mock_call.return_value = ("LLM response", 10, 20)
+        mock_call.return_value = ("LLM response", 10, 20, 0)
 
         response = client.post(
             "/v1/playground/compare-prompts",
@@ -6,6 +6,8 @@ from unittest.mock import AsyncMock, patch
 
 import httpx
 
+from app.services import llm_cache
+
 
 def _make_span(**overrides: object) -> dict[str, object]:
     """Build a valid span dict with sensible defaults."""
@@ -204,6 +206,47 @@ def _mock_anthropic_response(
     )
 
 
+@patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+@patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+def test_replay_deterministic_call_is_cached(mock_post: AsyncMock, client) -> None:
+    """A repeated temperature-0 replay is served from llm_cache."""
+    mock_post.return_value = _mock_openai_response("Cached response")
+
+    span = _make_llm_span()
+    client.post("/v1/spans", json={"spans": [span]})
+
+    body = {
+        "span_id": span["span_id"],
+        "modified_attributes": {"llm.temperature": 0.0},
+    }
+    first = client.post("/v1/replay", json=body)
+    second = client.post("/v1/replay", json=body)
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert mock_post.await_count == 1
+    first_output = first.json()["new_output"]
+    second_output = second.json()["new_output"]
+    assert second_output["llm.completion"] == first_output["llm.completion"]
+    assert first_output["llm.cache_hit"] is False
+    assert first_output["llm.cost_usd"] > 0
+    # A cache hit is not billed again
+    assert second_output["llm.cache_hit"] is True
+    assert second_output["llm.cost_usd"] == 0.0
+
+    # Non-deterministic replays always hit the provider
+    body["modified_attributes"] = {"llm.temperature": 0.7}
+    client.post("/v1/replay", json=body)
+    client.post("/v1/replay", json=body)
+    assert mock_post.await_count == 3
+
+
+def test_cache_key_accepts_integers_wider_than_64_bits() -> None:
+    messages = [{"role": "user", "content": "Hi", "seed": 2**70}]
+    key = llm_cache.make_key("openai", "gpt-4o", messages, 0.0, None)
+    assert key == llm_cache.make_key("openai", "gpt-4o", messages, 0.0, None)
+    assert len(key) == 64
+
+
 @patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"})
 @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
 def test_replay_anthropic_provider(mock_post: AsyncMock, client) -> None:
@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import uuid
 from typing import Any
+from unittest.mock import patch
 
 from starlette.testclient import TestClient
 
+from app import models
+
 
 def _make_span(**overrides: Any) -> dict[str, Any]:
     defaults: dict[str, Any] = {
@@ -90,3 +93,97 @@ def test_search_case_insensitive(client):
     response = client.get("/v1/search?q=openai")
     assert response.status_code == 200
     assert response.json()["total"] >= 1
+
+
+def test_search_dedupes_span_and_trace_name_matches(client):
+    trace_id = str(uuid.uuid4())
+    # The trace takes its name from the root span, so "checkout-flow" matches
+    # by span name AND trace name; "db-query" matches only via the trace.
+    _ingest_span(client, trace_id=trace_id, name="checkout-flow", start_time=1.0)
+    _ingest_span(
+        client,
+        trace_id=trace_id,
+        parent_span_id=str(uuid.uuid4()),
+        name="db-query",
+        start_time=2.0,
+    )
+
+    data = client.get("/v1/search?q=checkout").json()
+    assert data["total"] == 2
+    assert [r["name"] for r in data["results"]] == ["db-query", "checkout-flow"]
+
+    page = client.get("/v1/search?q=checkout&limit=1&offset=1").json()
+    assert page["total"] == 2
+    assert [r["name"] for r in page["results"]] == ["checkout-flow"]
+
+
+def test_search_attribute_match_returns_snippet(client):
+    _ingest_span(
+        client,
+        name="llm-call",
+        attributes={"llm.completion": "The service hit a rate_limit_exceeded error"},
+    )
+
+    data = client.get("/v1/search?q=rate_limit").json()
+    assert data["total"] == 1
+    assert "rate_limit" in data["results"][0]["match_context"]
+
+
+def test_search_index_follows_span_updates_and_deletes(client):
+    span = _ingest_span(client, name="llm-call", attributes={"note": "alpha-marker"})
+    assert client.get("/v1/search?q=alpha-marker").json()["total"] == 1
+
+    # Re-ingesting the span replaces its attributes in the index
+    span["attributes"] = {"note": "beta-marker"}
+    client.post("/v1/spans", json={"spans": [span]})
+    assert client.get("/v1/search?q=alpha-marker").json()["total"] == 0
+    assert client.get("/v1/search?q=beta-marker").json()["total"] == 1
+
+    # Deleting the trace cascades to its spans and their index rows
+    client.delete(f"/v1/traces/{span['trace_id']}")
+    assert client.get("/v1/search?q=beta-marker").json()["total"] == 0
+
+
+def test_search_short_query_falls_back_to_like(client):
+    _ingest_span(client, name="Q1")
+
+    data = client.get("/v1/search?q=q1").json()
+    assert data["total"] == 1
+
+
+def test_search_without_trigram_support_falls_back_to_like(client):
+    _ingest_span(client, name="llm-call", attributes={"note": "gamma-marker"})
+
+    with patch.object(models, "FTS_AVAILABLE", False):
+        data = client.get("/v1/search?q=gamma-marker").json()
+    assert data["total"] == 1
+    assert "gamma-marker" in data["results"][0]["match_context"]
+
+
+def test_search_short_query_context_ignores_attribute_case(client):
+    _ingest_span(client, name="llm-call", attributes={"note": "see XY-marker here"})
+
+    data = client.get("/v1/search?q=xy").json()
+    assert data["total"] == 1
+    assert "XY-marker" in data["results"][0]["match_context"]
+
+
+def test_search_blank_query_returns_nothing(client):
+    _ingest_span(client, name="has spaces in name")
+
+    data = client.get("/v1/search?q=%20%20").json()
+    assert data == {"results": [], "total": 0}
+
+
+def test_search_short_query_matches_attributes_and_trace_name_any_case(client):
+    root = _ingest_span(client, name="Ab-root", attributes={"k": "zz"})
+    _ingest_span(
+        client,
+        name="child",
+        parent_span_id=root["span_id"],
+        trace_id=root["trace_id"],
+        attributes={"k": "ZZ"},
+    )
+
+    assert client.get("/v1/search?q=zz").json()["total"] == 2
+    assert client.get("/v1/search?q=aB").json()["total"] == 2
@@ -71,9 +71,43 @@ class TestSettingsService:
         config_path.write_text("not valid json {{{")
         assert settings_service.get_api_key("openai") is None
 
+    def test_config_parsed_once_while_unchanged(self) -> None:
+        config_path = settings_service._CONFIG_PATH
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(json.dumps({"api_keys": {"openai": "sk-test"}}))
+        json_utils = settings_service.json_utils
+        with patch.object(json_utils, "loads", wraps=json_utils.loads) as mock_loads:
+            assert settings_service.get_api_key("openai") == "sk-test"
+            assert settings_service.get_api_key("openai") == "sk-test"
+        assert mock_loads.call_count == 1
+
+    def test_own_writes_do_not_trigger_a_reparse(self) -> None:
+        settings_service.set_api_key("openai", "sk-test")
+        json_utils = settings_service.json_utils
+        with patch.object(json_utils, "loads", wraps=json_utils.loads) as mock_loads:
+            assert settings_service.get_api_key("openai") == "sk-test"
+        assert mock_loads.call_count == 0
+
+    def test_external_config_edit_is_picked_up(self) -> None:
+        settings_service.set_api_key("openai", "sk-old")
+        assert settings_service.get_api_key("openai") == "sk-old"
+        config_path = settings_service._CONFIG_PATH
+        config_path.write_text(json.dumps({"api_keys": {"openai": "sk-new-key"}}))
+        assert settings_service.get_api_key("openai") == "sk-new-key"
+
+    def test_failed_write_leaves_cached_config_unchanged(self) -> None:
+        settings_service.set_api_key("openai", "sk-old")
+        with patch.object(settings_service, "_write_config", side_effect=OSError):
+            with pytest.raises(OSError):
+                settings_service.set_api_key("openai", "sk-new")
+        assert settings_service.get_api_key("openai") == "sk-old"
+
     def test_mask_key(self) -> None:
-        # "sk-abcdefghij" = 13 chars, mask first 9
-        assert settings_service._mask_key("sk-abcdefghij") == "•••••••••ghij"
+        # "sk-abcdefghij" = 13 chars, mask capped at 8
+        assert settings_service._mask_key("sk-abcdefghij") == "••••••••ghij"
+        assert settings_service._mask_key("sk-" + "x" * 200 + "wxyz") == (
+            "••••••••wxyz"
+        )
         assert settings_service._mask_key("ab") == "****"
         assert settings_service._mask_key("abcd") == "****"
         assert settings_service._mask_key("abcde") == "•bcde"
@@ -174,6 +174,23 @@ def test_get_span_by_id_returns_span(client):
     assert data["duration_ms"] is not None
 
 
+def test_ingest_span_with_integer_wider_than_64_bits(client, db_session):
+    from sqlalchemy import text
+
+    span_id = str(uuid.uuid4())
+    span = _make_span(
+        span_id=span_id, attributes={"order.id": 123456789012345678901234567890}
+    )
+    response = client.post("/v1/spans", json={"spans": [span]})
+    assert response.json()["accepted"] == 1
+
+    stored = db_session.execute(
+        text("SELECT attributes FROM spans WHERE span_id = :span_id"),
+        {"span_id": span_id},
+    ).scalar_one()
+    assert stored == '{"order.id":123456789012345678901234567890}'
+
+
 def test_get_span_by_id_not_found_returns_404(client):
     response = client.get(f"/v1/spans/{uuid.uuid4()}")
     assert response.status_code == 404
@@ -232,3 +249,81 @@ def test_sdk_language_defaults_to_none(client):
     assert response.status_code == 200
     data = response.json()
     assert data["sdk_language"] is None
+
+
+def test_span_create_to_response_matches_stored_span(db_session):
+    from app.schemas import SpanCreate
+    from app.services import span_service
+
+    for end_time in (1700000001.5, None):
+        span_data = SpanCreate(
+            **_make_span(
+                span_type="llm_call",
+                end_time=end_time,
+                attributes={"llm.model": "gpt-4.1"},
+                sdk_language="python",
+            )
+        )
+        span_service.ingest_spans(db_session, [span_data])
+        stored = span_service.get_span_by_id(db_session, span_data.span_id)
+
+        assert span_service.span_create_to_response(
+            span_data
+        ) == span_service.span_to_response(stored)
+
+
+def test_ingest_batch_rejects_only_the_failing_span(db_session):
+    from app.models import Span, Trace
+    from app.schemas import SpanCreate
+    from app.services import span_service
+
+    trace_id = str(uuid.uuid4())
+    good = [SpanCreate(**_make_span(trace_id=trace_id)) for _ in range(2)]
+    # Not JSON-serializable, so the write of this row fails
+    bad = SpanCreate(**_make_span(trace_id=trace_id, attributes={"x": object()}))
+
+    accepted, rejected = span_service.ingest_spans(db_session, [good[0], bad, good[1]])
+
+    assert (accepted, rejected) == (2, 1)
+    assert db_session.get(Span, bad.span_id) is None
+    assert db_session.get(Trace, trace_id).span_count == 2
+
+
+def test_ingest_resent_span_does_not_double_count_trace_totals(client, db_session):
+    trace_id = str(uuid.uuid4())
+    span_id = str(uuid.uuid4())
+    start = _make_span(
+        span_id=span_id, trace_id=trace_id, span_type="llm_call", status="unset"
+    )
+    end = _make_span(
+        span_id=span_id,
+        trace_id=trace_id,
+        span_type="llm_call",
+        attributes={"llm.cost_usd": 0.05, "llm.tokens.total": 1000},
+    )
+    client.post("/v1/spans", json={"spans": [start]})
+    client.post("/v1/spans", json={"spans": [end, end]})
+
+    from app.models import Trace
+
+    trace = db_session.get(Trace, trace_id)
+    assert trace.span_count == 1
+    assert trace.total_cost_usd == 0.05
+    assert trace.total_tokens == 1000
+    assert trace.status == "ok"
+
+
+def test_trace_status_follows_span_status_updates(client, db_session):
+    trace_id = str(uuid.uuid4())
+    span_id = str(uuid.uuid4())
+    other = _make_span(trace_id=trace_id, status="ok")
+    client.post("/v1/spans", json={"spans": [other]})
+
+    from app.models import Trace
+
+    for status, expected in (("unset", "unset"), ("error", "error"), ("ok", "ok")):
+        span = _make_span(span_id=span_id, trace_id=trace_id, status=status)
+        client.post("/v1/spans", json={"spans": [span]})
+        trace = db_session.get(Trace, trace_id)
+        assert trace.status == expected
+    assert (trace.error_count, trace.pending_count) == (0, 0)
@@ -139,6 +139,32 @@ def test_get_trace_detail_includes_duration(client):
     assert data["duration_ms"] == 2500.0
 
 
+def test_get_trace_detail_loads_trace_and_spans_in_one_query(client, db_session):
+    from sqlalchemy import event
+
+    from app.services import trace_service
+
+    trace_id = str(uuid.uuid4())
+    for start in (1700000002.0, 1700000001.0):
+        _ingest_span(client, trace_id=trace_id, start_time=start, end_time=start)
+    db_session.expire_all()
+
+    statements: list[str] = []
+    engine = db_session.get_bind()
+
+    def listener(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        detail = trace_service.get_trace_detail(db_session, trace_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert [s.start_time for s in detail.spans] == [1700000001.0, 1700000002.0]
+
+
 # --- GET /v1/traces/{trace_id}/graph ---
 
 
@@ -237,6 +263,16 @@ def test_get_trace_graph_extracts_llm_cost(client):
     assert node["data"]["cost_usd"] == 0.0042
 
 
+def test_get_trace_graph_extracts_framework(client):
+    trace_id = str(uuid.uuid4())
+    _ingest_span(client, trace_id=trace_id, attributes={"agent.framework": "crewai"})
+    _ingest_span(client, trace_id=trace_id)
+
+    response = client.get(f"/v1/traces/{trace_id}/graph")
+    frameworks = [node["data"]["framework"] for node in response.json()["nodes"]]
+    assert set(frameworks) == {"crewai", None}
+
+
 def test_get_trace_graph_root_node_has_no_incoming_edge(client):
     trace_id = str(uuid.uuid4())
     root_id = str(uuid.uuid4())
@@ -0,0 +1,120 @@
+"""Tests for WebSocket broadcast fan-out."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from app.ws.manager import ConnectionManager
+
+
+class _FakeSocket:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.frames: list[str] = []
+        self.close_codes: list[int] = []
+
+    async def send_text(self, text: str) -> None:
+        await asyncio.sleep(self.delay)
+        self.frames.append(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_codes.append(code)
+
+
+async def test_broadcast_sends_one_encoded_frame_to_each_client() -> None:
+    manager = ConnectionManager()
+    sockets = [_FakeSocket(), _FakeSocket()]
+    manager.active_connections.update(sockets)
+
+    await manager.broadcast_span({"span_id": "s1", "trace_id": "t1"})
+
+    for ws in sockets:
+        assert [json.loads(f) for f in ws.frames] == [
+            {"event": "span_created", "span": {"span_id": "s1", "trace_id": "t1"}}
+        ]
+
+
+async def test_slow_client_is_dropped_without_blocking_others() -> None:
+    manager = ConnectionManager()
+    fast, slow = _FakeSocket(), _FakeSocket(delay=10)
+    manager.active_connections.update({fast, slow})
+
+    with patch("app.ws.manager.SEND_TIMEOUT_S", 0.05):
+        await asyncio.wait_for(
+            manager.broadcast_trace_created({"trace_id": "t1"}), timeout=1
+        )
+
+    assert len(fast.frames) == 1
+    assert manager.active_connections == {fast}
+
+
+async def test_dropped_client_is_closed_with_try_again_later() -> None:
+    manager = ConnectionManager()
+    slow = _FakeSocket(delay=10)
+    manager.active_connections.add(slow)
+
+    with patch("app.ws.manager.SEND_TIMEOUT_S", 0.05):
+        await manager.broadcast_trace_created({"trace_id": "t1"})
+        await asyncio.gather(*manager._closing)
+
+    assert slow.close_codes == [1013]
+    assert not manager._closing
+
+
+async def test_span_frames_carry_slim_attributes_unless_opted_in() -> None:
+    manager = ConnectionManager()
+    slim_ws, full_ws = _FakeSocket(), _FakeSocket()
+    manager.active_connections.add(slim_ws)
+    manager.trace_subscriptions["t1"] = {full_ws}
+    manager.full_attribute_clients.add(full_ws)
+    attributes = {"llm.model": "gpt-4.1", "llm.prompt": "x" * 1000}
+
+    await manager.broadcast_span(
+        {"span_id": "s1", "trace_id": "t1", "attributes": attributes}
+    )
+
+    slim = json.loads(slim_ws.frames[0])["span"]
+    assert slim["attributes"] == {"llm.model": "gpt-4.1"}
+    assert slim["attributes_truncated"] is True
+    full = json.loads(full_ws.frames[0])["span"]
+    assert full["attributes"] == attributes
+    assert "attributes_truncated" not in full
+
+
+async def test_client_in_both_active_and_trace_set_gets_one_frame() -> None:
+    manager = ConnectionManager()
+    ws = _FakeSocket()
+    manager.active_connections.add(ws)
+    manager.trace_subscriptions["t1"] = {ws}
+
+    await manager.broadcast_span_delta("s1", "t1", "Hel")
+
+    assert len(ws.frames) == 1
+
+
+def test_disconnect_clears_only_own_subscriptions_and_empty_buckets() -> None:
+    manager = ConnectionManager()
+    ws, other = _FakeSocket(), _FakeSocket()
+    manager.subscribe(ws, "t1")
+    manager.subscribe(ws, "t2", include_attributes=True)
+    manager.subscribe(other, "t2")
+
+    manager.disconnect(ws)
+
+    assert manager.trace_subscriptions == {"t2": {other}}
+    assert ws not in manager.ws_traces
+    assert ws not in manager.full_attribute_clients
+
+
+def test_unsubscribe_drops_empty_bucket_and_returns_to_global_stream() -> None:
+    manager = ConnectionManager()
+    ws = _FakeSocket()
+    manager.subscribe(ws, "t1")
+
+    manager.unsubscribe(ws, "t1")
+
+    assert manager.trace_subscriptions == {}
+    assert manager.ws_traces == {}
+    assert manager.active_connections == {ws}
@@ -12,6 +12,7 @@ import { useTraceStore } from "@/store/trace";
 
 export default function App() {
   const appendSpan = useTraceStore((s) => s.appendSpan);
+  const appendSpanDelta = useTraceStore((s) => s.appendSpanDelta);
   const prependTrace = useTraceStore((s) => s.prependTrace);
   const wsRef = useRef<BeaconWebSocket | null>(null);
 
@@ -23,6 +24,9 @@ export default function App() {
     const unsubSpan = ws.onSpanCreated((event) => {
       appendSpan(event.span);
     });
+    const unsubDelta = ws.onSpanDelta((event) => {
+      appendSpanDelta(event.span_id, event.delta);
+    });
     const unsubTrace = ws.onTraceCreated((event) => {
       prependTrace({
         ...event.trace,
@@ -37,10 +41,11 @@ export default function App() {
 
     return () => {
       unsubSpan();
+      unsubDelta();
       unsubTrace();
       ws.disconnect();
     };
-  }, [appendSpan, prependTrace]);
+  }, [appendSpan, appendSpanDelta, prependTrace]);
 
   return (
     <div className="flex h-screen w-screen overflow-hidden bg-sidebar text-foreground">
@@ -12,6 +12,7 @@ vi.mock("@/lib/api", () => ({
   getTraces: vi.fn(),
   getTrace: vi.fn(),
   getTraceGraph: vi.fn(),
+  getSpan: vi.fn(),
   postReplay: vi.fn(),
   deleteTrace: vi.fn(),
 }));
@@ -165,6 +166,107 @@ describe("useTraceStore", () => {
       expect(state.graphData?.nodes).toHaveLength(2);
       expect(state.graphData?.edges).toHaveLength(1);
     });
+
+    it("replaces a span that is already in selectedTrace", () => {
+      const pending = makeSpan({
+        trace_id: "t1",
+        span_id: "live",
+        status: "unset",
+        end_time: null,
+      });
+      useTraceStore.setState({
+        traces: [makeTrace({ trace_id: "t1", span_count: 1 })],
+        selectedTraceId: "t1",
+        selectedTrace: makeTraceDetail({ trace_id: "t1", spans: [pending] }),
+      });
+
+      useTraceStore
+        .getState()
+        .appendSpan({ ...pending, status: "ok", end_time: 1_700_000_001 });
+
+      const state = useTraceStore.getState();
+      expect(state.traces[0].span_count).toBe(1);
+      expect(state.selectedTrace?.spans).toHaveLength(1);
+      expect(state.selectedTrace?.spans[0].status).toBe("ok");
+    });
+  });
+
+  describe("appendSpanDelta", () => {
+    it("appends the delta to the span's llm.completion", () => {
+      const span = makeSpan({
+        trace_id: "t1",
+        span_id: "live",
+        attributes: { "llm.completion": "Hel" },
+      });
+      useTraceStore.setState({
+        selectedTraceId: "t1",
+        selectedTrace: makeTraceDetail({ trace_id: "t1", spans: [span] }),
+        selectedSpanId: "live",
+        selectedSpan: span,
+      });
+
+      useTraceStore.getState().appendSpanDelta("live", "lo");
+
+      const state = useTraceStore.getState();
+      expect(state.selectedTrace?.spans[0].attributes["llm.completion"]).toBe(
+        "Hello",
+      );
+      expect(state.selectedSpan?.attributes["llm.completion"]).toBe("Hello");
+    });
+
+    it("keeps the streamed completion when a slim final frame arrives", () => {
+      const pending = makeSpan({
+        trace_id: "t1",
+        span_id: "live",
+        status: "unset",
+        end_time: null,
+        attributes: { "llm.prompt": [{ role: "user", content: "Hi" }] },
+      });
+      useTraceStore.setState({
+        traces: [makeTrace({ trace_id: "t1", span_count: 1 })],
+        selectedTraceId: "t1",
+        selectedTrace: makeTraceDetail({ trace_id: "t1", spans: [pending] }),
+        selectedSpanId: "live",
+        selectedSpan: pending,
+      });
+      api.getSpan.mockResolvedValueOnce({
+        ...pending,
+        status: "ok",
+        attributes: { ...pending.attributes, "llm.completion": "Hello" },
+      });
+
+      const store = useTraceStore.getState();
+      store.appendSpanDelta("live", "Hel");
+      store.appendSpanDelta("live", "lo");
+      store.appendSpan({
+        ...pending,
+        status: "ok",
+        end_time: 1_700_000_001,
+        attributes: { "llm.cost_usd": 0.01 },
+        attributes_truncated: true,
+      });
+
+      const state = useTraceStore.getState();
+      const attributes = state.selectedTrace?.spans[0].attributes;
+      expect(state.selectedTrace?.spans).toHaveLength(1);
+      expect(attributes?.["llm.completion"]).toBe("Hello");
+      expect(attributes?.["llm.prompt"]).toEqual([
+        { role: "user", content: "Hi" },
+      ]);
+      expect(attributes?.["llm.cost_usd"]).toBe(0.01);
+      expect(state.selectedSpan?.status).toBe("ok");
+      expect(state.selectedSpan?.attributes["llm.completion"]).toBe("Hello");
+      expect(api.getSpan).toHaveBeenCalledWith("live");
+    });
+
+    it("ignores deltas for spans that are not shown", () => {
+      const detail = makeTraceDetail({ trace_id: "t1", spans: [] });
+      useTraceStore.setState({ selectedTraceId: "t1", selectedTrace: detail });
+
+      useTraceStore.getState().appendSpanDelta("unknown", "x");
+
+      expect(useTraceStore.getState().selectedTrace).toBe(detail);
+    });
   });
 
   describe("deleteTrace", () => {
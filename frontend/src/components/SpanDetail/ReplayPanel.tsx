@@ -11,6 +11,7 @@ interface ReplayPanelProps {
 }
 
 function formatPrompt(value: unknown): string {
+  if (Array.isArray(value)) return JSON.stringify(value, null, 2);
   if (typeof value !== "string") return "[]";
   try {
     return JSON.stringify(JSON.parse(value), null, 2);
@@ -32,6 +32,8 @@ export interface Span {
   attributes: Record<string, unknown>;
   annotations: Annotation[];
   sdk_language?: string | null;
+  /** Set on live WebSocket spans whose attributes were cut down to a preview */
+  attributes_truncated?: boolean;
 }
 
 export interface TraceSummary {
@@ -98,6 +100,7 @@ export interface ReplayResult {
     "llm.tokens.input": number;
     "llm.tokens.output": number;
     "llm.cost_usd": number;
+    "llm.cache_hit"?: boolean;
   };
   diff: {
     old_completion: string;
@@ -375,6 +378,9 @@ export interface PromptVersionListResponse {
 
 export type WsEvent =
   | { event: "span_created"; span: Span }
+  | { event: "spans_created"; spans: Span[] }
+  | { event: "span_pending"; span: Span }
+  | { event: "span_delta"; span_id: string; delta: string }
   | {
       event: "span_updated";
       span_id: string;
@@ -20,10 +20,12 @@ export class BeaconWebSocket {
   private handlers: {
     span_created: Array<EventHandler<"span_created">>;
     span_updated: Array<EventHandler<"span_updated">>;
+    span_delta: Array<EventHandler<"span_delta">>;
     trace_created: Array<EventHandler<"trace_created">>;
   } = {
     span_created: [],
     span_updated: [],
+    span_delta: [],
     trace_created: [],
   };
 
@@ -37,6 +39,22 @@ export class BeaconWebSocket {
 
     this.ws.onmessage = (event: MessageEvent) => {
       const data = JSON.parse(String(event.data)) as WsEvent;
+      if (data.event === "spans_created") {
+        // Batched frame: fan out as individual span_created events
+        for (const span of data.spans) {
+          for (const handler of this.handlers.span_created) {
+            handler({ event: "span_created", span });
+          }
+        }
+        return;
+      }
+      if (data.event === "span_pending") {
+        // In-flight span that is not persisted yet; render it like a new span
+        for (const handler of this.handlers.span_created) {
+          handler({ event: "span_created", span: data.span });
+        }
+        return;
+      }
       const eventHandlers = this.handlers[data.event];
       if (eventHandlers) {
         for (const handler of eventHandlers) {
@@ -67,8 +85,12 @@ export class BeaconWebSocket {
     this.ws = null;
   }
 
-  subscribeToTrace(traceId: string): void {
-    this.send({ action: "subscribe_trace", trace_id: traceId });
+  subscribeToTrace(traceId: string, includeAttributes = false): void {
+    this.send({
+      action: "subscribe_trace",
+      trace_id: traceId,
+      include_attributes: includeAttributes,
+    });
   }
 
   unsubscribeTrace(traceId: string): void {
@@ -93,6 +115,15 @@ export class BeaconWebSocket {
     };
   }
 
+  onSpanDelta(handler: EventHandler<"span_delta">): () => void {
+    this.handlers.span_delta.push(handler);
+    return () => {
+      this.handlers.span_delta = this.handlers.span_delta.filter(
+        (h) => h !== handler,
+      );
+    };
+  }
+
   onTraceCreated(handler: EventHandler<"trace_created">): () => void {
     this.handlers.trace_created.push(handler);
     return () => {
@@ -1,6 +1,7 @@
 import { create } from "zustand";
 import {
   deleteTrace as apiDeleteTrace,
+  getSpan,
   getTrace,
   getTraceGraph,
   getTraces,
@@ -45,6 +46,7 @@ interface TraceStore {
   loadTraces: () => Promise<void>;
   selectTrace: (traceId: string) => Promise<void>;
   selectSpan: (spanId: string) => void;
+  loadFullSpan: (spanId: string) => Promise<void>;
   setTimeTravelIndex: (index: number | null) => void;
   runReplay: (
     spanId: string,
@@ -52,6 +54,7 @@ interface TraceStore {
   ) => Promise<void>;
   clearReplay: () => void;
   appendSpan: (span: Span) => void;
+  appendSpanDelta: (spanId: string, delta: string) => void;
   prependTrace: (trace: TraceSummary) => void;
   deleteTrace: (traceId: string) => Promise<void>;
   clearBackendError: () => void;
@@ -122,6 +125,33 @@ export const useTraceStore = create<TraceStore>((set, get) => ({
     const span =
       selectedTrace?.spans.find((s) => s.span_id === spanId) ?? null;
     set({ selectedSpanId: spanId, selectedSpan: span });
+    if (span?.attributes_truncated) {
+      void get().loadFullSpan(spanId);
+    }
+  },
+
+  loadFullSpan: async (spanId: string) => {
+    let span: Span;
+    try {
+      span = await getSpan(spanId);
+    } catch {
+      // In-flight spans are not persisted yet; keep the live preview
+      return;
+    }
+    const { selectedTrace, selectedSpanId } = get();
+    if (selectedTrace) {
+      set({
+        selectedTrace: {
+          ...selectedTrace,
+          spans: selectedTrace.spans.map((s) =>
+            s.span_id === spanId ? span : s,
+          ),
+        },
+      });
+    }
+    if (selectedSpanId === spanId) {
+      set({ selectedSpan: span });
+    }
   },
 
   setTimeTravelIndex: (index: number | null) => {
@@ -132,6 +162,9 @@ export const useTraceStore = create<TraceStore>((set, get) => ({
       const span =
         selectedTrace?.spans.find((s) => s.span_id === nodeAtIndex.id) ?? null;
       set({ selectedSpanId: nodeAtIndex.id, selectedSpan: span });
+      if (span?.attributes_truncated) {
+        void get().loadFullSpan(nodeAtIndex.id);
+      }
     }
   },
 
@@ -157,7 +190,63 @@ export const useTraceStore = create<TraceStore>((set, get) => ({
   },
 
   appendSpan: (span: Span) => {
-    const { selectedTraceId, selectedTrace, graphData } = get();
+    const { selectedTraceId, selectedTrace, graphData, selectedSpanId } =
+      get();
+
+    // A live span that is already shown (e.g. pending, then finished)
+    // replaces its earlier version instead of adding a duplicate node
+    const existing =
+      span.trace_id === selectedTraceId
+        ? selectedTrace?.spans.find((s) => s.span_id === span.span_id)
+        : undefined;
+    if (selectedTrace && existing) {
+      // Slim frames drop prompt/completion; keep what is already shown
+      const merged: Span = span.attributes_truncated
+        ? {
+            ...span,
+            attributes: { ...existing.attributes, ...span.attributes },
+          }
+        : span;
+      set({
+        selectedTrace: {
+          ...selectedTrace,
+          spans: selectedTrace.spans.map((s) =>
+            s.span_id === span.span_id ? merged : s,
+          ),
+        },
+        ...(graphData
+          ? {
+              graphData: {
+                ...graphData,
+                nodes: graphData.nodes.map((n) =>
+                  n.id === span.span_id
+                    ? {
+                        ...n,
+                        data: {
+                          ...n.data,
+                          status: span.status,
+                          duration_ms:
+                            span.end_time !== null
+                              ? (span.end_time - span.start_time) * 1000
+                              : null,
+                          cost_usd:
+                            typeof span.attributes["llm.cost_usd"] === "number"
+                              ? span.attributes["llm.cost_usd"]
+                              : null,
+                        },
+                      }
+                    : n,
+                ),
+              },
+            }
+          : {}),
+        ...(selectedSpanId === span.span_id ? { selectedSpan: merged } : {}),
+      });
+      if (selectedSpanId === span.span_id && span.attributes_truncated) {
+        void get().loadFullSpan(span.span_id);
+      }
+      return;
+    }
 
     // Update span count in trace list
     set({
@@ -218,6 +307,28 @@ export const useTraceStore = create<TraceStore>((set, get) => ({
     }
   },
 
+  appendSpanDelta: (spanId: string, delta: string) => {
+    const { selectedTrace, selectedSpanId } = get();
+    const span = selectedTrace?.spans.find((s) => s.span_id === spanId);
+    if (!selectedTrace || !span) return;
+
+    const previous = span.attributes["llm.completion"];
+    const completion = (typeof previous === "string" ? previous : "") + delta;
+    const updated: Span = {
+      ...span,
+      attributes: { ...span.attributes, "llm.completion": completion },
+    };
+    set({
+      selectedTrace: {
+        ...selectedTrace,
+        spans: selectedTrace.spans.map((s) =>
+          s.span_id === spanId ? updated : s,
+        ),
+      },
+      ...(selectedSpanId === spanId ? { selectedSpan: updated } : {}),
+    });
+  },
+
   prependTrace: (trace: TraceSummary) => {
     set({ traces: [trace, ...get().traces] });
   },